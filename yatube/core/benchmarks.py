@@ -0,0 +1,62 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.db import connection
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of a non-empty list of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1,
+                      round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds of samples taken in seconds."""
+    if not samples:
+        return {'count': 0}
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def timed(function, iterations):
+    """Call ``function`` repeatedly, returning per-call durations."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def database_info():
+    """Backend a benchmark ran against, to tell reports apart."""
+    info = {
+        'vendor': connection.vendor,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+    }
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for name in settings.SQLITE_PRAGMAS:
+                cursor.execute(f'PRAGMA {name}')
+                info[name] = cursor.fetchone()[0]
+    return info
+
+
+def write_report(command, report, output=None):
+    """Emit a benchmark report as JSON to a file or the command stdout."""
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if output:
+        with open(output, 'w', encoding='utf-8') as report_file:
+            report_file.write(text + '\n')
+        command.stderr.write(f'Report written to {output}')
+    else:
+        command.stdout.write(text)
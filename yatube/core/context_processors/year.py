@@ -1,8 +1,24 @@
+import time
+
 from django.utils import timezone
 
+_current = {'year': None, 'until': 0.0}
+
+
+def next_new_year(now):
+    """Timestamp of the midnight that starts the year after ``now``."""
+    return now.replace(
+        year=now.year + 1, month=1, day=1,
+        hour=0, minute=0, second=0, microsecond=0,
+    ).timestamp()
+
 
 def year(request):
-    year = timezone.now()
+    """Current year, looked up again only once the year is over."""
+    if time.time() >= _current['until']:
+        now = timezone.localtime()
+        _current['year'] = now.year
+        _current['until'] = next_new_year(now)
     return {
-        'year': year.year
+        'year': _current['year']
     }
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection.
+
+    Connected to ``connection_created`` by CoreConfig. WAL lets feed
+    readers carry on while a post is being written, and busy_timeout makes
+    a second writer wait for the lock instead of failing at once.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(**kwargs):
+    """Drop persistent connections that died between two requests.
+
+    Connected to ``request_started`` when DATABASE_HEALTH_CHECKS is on.
+    Only connections kept open with CONN_MAX_AGE are checked, so the
+    request that follows a database restart opens a new connection
+    instead of failing on the stale one.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict['CONN_MAX_AGE'] != 0
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,13 @@
+def query_budget(queries):
+    """Declare how many SQL queries one request to the view may issue.
+
+    The budget counts every query of the request, session and user lookups
+    included, for the most expensive case: a logged-in user and, for forms,
+    a successful POST. It is kept on the view function, where decorators
+    built on ``functools.wraps`` carry it outwards, and the posts tests
+    fail any route that goes over it.
+    """
+    def decorator(view):
+        view.query_budget = queries
+        return view
+    return decorator
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 with the number of iterations taken from the settings.
+
+    The algorithm name is Django's, so existing hashes keep working, and a
+    hash made with a different PASSWORD_HASH_ITERATIONS is replaced with a
+    new one the next time its user logs in.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
@@ -0,0 +1,220 @@
+import base64
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .benchmarks import summarize
+
+logger = logging.getLogger('yatube.mail')
+
+QUEUED = 'queue'
+SENDING = 'sending'
+FAILED = 'failed'
+
+
+def spool_path(state):
+    path = os.path.join(settings.EMAIL_QUEUE_PATH, state)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_name(not_before):
+    """Queue file name; names sort in the order messages become due."""
+    return f'{int(not_before * 1000):015d}-{uuid.uuid4().hex}.json'
+
+
+def write_entry(entry, not_before):
+    """Add an entry to the queue without readers seeing partial files."""
+    name = file_name(not_before)
+    temp = os.path.join(spool_path(SENDING), f'.{name}')
+    with open(temp, 'w', encoding='utf-8') as spool_file:
+        json.dump(entry, spool_file, ensure_ascii=False)
+    os.replace(temp, os.path.join(spool_path(QUEUED), name))
+
+
+def encode(message):
+    attachments = []
+    for filename, content, mimetype in message.attachments:
+        if isinstance(content, str):
+            content = content.encode(
+                message.encoding or settings.DEFAULT_CHARSET
+            )
+        attachments.append(
+            (filename, base64.b64encode(content).decode('ascii'), mimetype)
+        )
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+        'attachments': attachments,
+    }
+
+
+def decode(data):
+    message = EmailMultiAlternatives(
+        subject=data['subject'],
+        body=data['body'],
+        from_email=data['from_email'],
+        to=data['to'],
+        cc=data['cc'],
+        bcc=data['bcc'],
+        reply_to=data['reply_to'],
+        headers=data['headers'],
+        alternatives=[tuple(item) for item in data['alternatives']],
+    )
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+def queue_depth():
+    """Number of messages waiting to be sent and of given up ones."""
+    return {
+        state: sum(
+            1 for name in os.listdir(spool_path(state))
+            if not name.startswith('.')
+        )
+        for state in (QUEUED, FAILED)
+    }
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Email backend that only spools messages for ``send_queued_mail``.
+
+    Each message becomes a JSON file in EMAIL_QUEUE_PATH, so views such as
+    password reset return without waiting for the mail server.
+    """
+
+    def send_messages(self, email_messages):
+        queued_at = time.time()
+        sent = 0
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            try:
+                write_entry({
+                    'message': encode(message),
+                    'queued_at': queued_at,
+                    'attempts': 0,
+                }, queued_at)
+            except OSError:
+                if not self.fail_silently:
+                    raise
+                continue
+            sent += 1
+        return sent
+
+
+class MailQueue:
+    """Sends due queued messages in batches over one connection.
+
+    A message that fails is queued again EMAIL_QUEUE_RETRY_DELAY seconds
+    later, the delay doubling with every attempt, and moved to the failed
+    directory after EMAIL_QUEUE_MAX_ATTEMPTS attempts.
+    """
+
+    SAMPLES = 1000
+
+    def __init__(self, backend=None):
+        self.backend = backend or settings.EMAIL_QUEUE_BACKEND
+        self.latencies = deque(maxlen=self.SAMPLES)
+
+    def claim(self, batch_size):
+        """Move up to ``batch_size`` due messages to the sending directory.
+
+        Renaming is atomic, so several workers never take the same file.
+        """
+        now = int(time.time() * 1000)
+        claimed = []
+        for name in sorted(os.listdir(spool_path(QUEUED))):
+            if len(claimed) == batch_size or int(name.split('-')[0]) > now:
+                break
+            path = os.path.join(spool_path(SENDING), name)
+            try:
+                os.replace(os.path.join(spool_path(QUEUED), name), path)
+            except FileNotFoundError:
+                continue
+            # The claim time tells requeue_stale() how long it has been out.
+            os.utime(path)
+            claimed.append(path)
+        return claimed
+
+    def requeue_stale(self, age):
+        """Queue again messages claimed ``age`` seconds ago or earlier.
+
+        They were left behind by a worker that stopped mid-batch.
+        """
+        requeued = 0
+        deadline = time.time() - age
+        for name in os.listdir(spool_path(SENDING)):
+            path = os.path.join(spool_path(SENDING), name)
+            if name.startswith('.') or os.path.getmtime(path) > deadline:
+                continue
+            os.replace(path, os.path.join(spool_path(QUEUED), name))
+            requeued += 1
+        return requeued
+
+    def send_batch(self, batch_size):
+        """Send one batch, returning counts of sent, retried and failed."""
+        counts = {'sent': 0, 'retried': 0, 'failed': 0}
+        paths = self.claim(batch_size)
+        if not paths:
+            return counts
+        entries = []
+        for path in paths:
+            with open(path, encoding='utf-8') as spool_file:
+                entries.append((path, json.load(spool_file)))
+        connection = get_connection(self.backend)
+        try:
+            connection.open()
+        except Exception:
+            logger.exception('Could not connect to send queued mail')
+            for path, entry in entries:
+                counts[self.retry(path, entry)] += 1
+            return counts
+        try:
+            for path, entry in entries:
+                try:
+                    connection.send_messages([decode(entry['message'])])
+                except Exception:
+                    logger.exception('Could not send queued mail %s', path)
+                    counts[self.retry(path, entry)] += 1
+                    continue
+                os.remove(path)
+                self.latencies.append(time.time() - entry['queued_at'])
+                counts['sent'] += 1
+        finally:
+            connection.close()
+        return counts
+
+    def retry(self, path, entry):
+        entry['attempts'] += 1
+        if entry['attempts'] >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            os.replace(
+                path,
+                os.path.join(spool_path(FAILED), os.path.basename(path))
+            )
+            return 'failed'
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (
+            entry['attempts'] - 1
+        )
+        write_entry(entry, time.time() + delay)
+        os.remove(path)
+        return 'retried'
+
+    def report(self):
+        """Queue depth and enqueue-to-send latency of the sent messages."""
+        return {**queue_depth(), 'latency': summarize(self.latencies)}
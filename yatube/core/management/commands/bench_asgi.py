@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from core.asgi import WsgiToAsgi, build_environ, run_wsgi
+from core.benchmarks import database_info, summarize, write_report
+from posts.models import Group, Post
+
+
+def feed_urls():
+    post = Post.objects.select_related('author').first()
+    group = Group.objects.order_by('-post_count').first()
+    urls = [reverse('posts:index')]
+    if group is not None:
+        urls.append(reverse('posts:group_list', kwargs={'slug': group.slug}))
+    if post is not None:
+        urls.append(reverse(
+            'posts:profile', kwargs={'username': post.author.username}
+        ))
+        urls.append(reverse('posts:post_detail', kwargs={'post_id': post.pk}))
+    return urls
+
+
+def http_scope(url):
+    parts = urlsplit(url)
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'query_string': parts.query.encode(),
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Compare the feed views served through yatube/asgi.py with '
+            'synchronous WSGI workers under concurrent load, by default '
+            'with as many workers as ASGI threads.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=32,
+            help='Requests in flight at the same time.',
+        )
+        parser.add_argument(
+            '--wsgi-workers',
+            type=int,
+            help=('Synchronous workers of the WSGI run; --asgi-threads by '
+                  'default, so both runs have the same parallelism.'),
+        )
+        parser.add_argument(
+            '--asgi-threads',
+            type=int,
+            default=16,
+            help='Size of the thread pool of the ASGI run.',
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        if options['wsgi_workers'] is None:
+            options['wsgi_workers'] = options['asgi_threads']
+        urls = feed_urls()
+        targets = [urls[i % len(urls)] for i in range(options['requests'])]
+        wsgi_application = WSGIHandler()
+        report = {
+            'database': database_info(),
+            'urls': urls,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'wsgi_workers': options['wsgi_workers'],
+            'asgi_threads': options['asgi_threads'],
+            'wsgi': self.run_wsgi(wsgi_application, targets, options),
+            'asgi': asyncio.run(self.run_asgi(
+                WsgiToAsgi(wsgi_application, options['asgi_threads']),
+                targets,
+                options,
+            )),
+        }
+        write_report(self, report, options['output'])
+
+    def run_wsgi(self, application, targets, options):
+        # Each client waits for a free worker, and the wait is part of the
+        # latency it sees.
+        workers = threading.BoundedSemaphore(options['wsgi_workers'])
+        statuses = Counter()
+
+        def request(url):
+            queued = time.perf_counter()
+            with workers:
+                status, headers, body = run_wsgi(
+                    application, build_environ(http_scope(url), b'')
+                )
+            statuses[status] += 1
+            return time.perf_counter() - queued
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as clients:
+            samples = list(clients.map(request, targets))
+        return self.result(samples, started, statuses)
+
+    async def run_asgi(self, application, targets, options):
+        in_flight = asyncio.Semaphore(options['concurrency'])
+        statuses = Counter()
+
+        async def request(url):
+            async with in_flight:
+                queued = time.perf_counter()
+                messages = []
+
+                async def receive():
+                    return {'type': 'http.request', 'body': b''}
+
+                async def send(message):
+                    messages.append(message)
+
+                await application(http_scope(url), receive, send)
+                statuses[messages[0]['status']] += 1
+                return time.perf_counter() - queued
+
+        started = time.perf_counter()
+        try:
+            samples = await asyncio.gather(*map(request, targets))
+        finally:
+            application.executor.shutdown()
+        return self.result(samples, started, statuses)
+
+    def result(self, samples, started, statuses):
+        elapsed = time.perf_counter() - started
+        return {
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'statuses': dict(statuses),
+            **summarize(samples),
+        }
@@ -0,0 +1,80 @@
+import statistics
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (check_password, identify_hasher,
+                                         make_password)
+from django.contrib.auth.password_validation import (
+    CommonPasswordValidator, validate_password
+)
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmarks import summarize, timed, write_report
+
+User = get_user_model()
+
+PASSWORD = 'bench-login-password'
+
+
+def per_second(samples):
+    return round(1 / statistics.mean(samples), 1)
+
+
+class Command(BaseCommand):
+    help = ('Measure logins per second on one core through the login view, '
+            'and the hashing cost of candidate PBKDF2 iteration counts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+        parser.add_argument(
+            '--pbkdf2', type=int, nargs='*',
+            default=[150000, 100000, 60000, 20000],
+            help='PASSWORD_HASH_ITERATIONS values to compare.',
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        logins = options['logins']
+        report = {
+            'hashers': settings.PASSWORD_HASHERS,
+            'iterations': settings.PASSWORD_HASH_ITERATIONS,
+        }
+        # The benchmark user and sessions are rolled back afterwards.
+        with transaction.atomic():
+            user = User.objects.create_user('bench-login', password=PASSWORD)
+            report['algorithm'] = identify_hasher(user.password).algorithm
+            client = Client()
+            url = reverse('users:login')
+            samples = timed(
+                lambda: client.post(url, {
+                    'username': user.username,
+                    'password': PASSWORD,
+                }),
+                logins
+            )
+            report['login'] = {
+                **summarize(samples),
+                'per_second': per_second(samples),
+            }
+            transaction.set_rollback(True)
+        report['pbkdf2'] = {}
+        for iterations in options['pbkdf2']:
+            with override_settings(PASSWORD_HASH_ITERATIONS=iterations):
+                encoded = make_password(PASSWORD, hasher='pbkdf2_sha256')
+                samples = timed(
+                    lambda: check_password(PASSWORD, encoded), logins
+                )
+            report['pbkdf2'][iterations] = {
+                **summarize(samples),
+                'per_second': per_second(samples),
+            }
+        cold = timed(CommonPasswordValidator, 5)
+        preloaded = timed(lambda: validate_password(PASSWORD), logins)
+        report['validators'] = {
+            'load_common_passwords': summarize(cold),
+            'validate_preloaded': summarize(preloaded),
+        }
+        write_report(self, report, options['output'])
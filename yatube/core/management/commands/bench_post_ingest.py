@@ -0,0 +1,86 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.benchmarks import database_info, summarize, write_report
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Create posts through post_create from concurrent clients, '
+            'with and without POST_WRITE_BEHIND, and report throughput.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8)
+        parser.add_argument(
+            '--posts', type=int, default=25,
+            help='Posts created by every client.',
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(f'bench-ingest-{uuid.uuid4().hex}')
+        report = {
+            'database': database_info(),
+            'clients': options['clients'],
+            'posts_per_client': options['posts'],
+        }
+        try:
+            for name, write_behind in (('direct', False),
+                                       ('write_behind', True)):
+                with override_settings(POST_WRITE_BEHIND=write_behind):
+                    report[name] = self.measure(user, options)
+        finally:
+            # Deleting the user deletes the posts, their counters included.
+            user.delete()
+        write_report(self, report, options['output'])
+
+    def measure(self, user, options):
+        url = reverse('posts:post_create')
+        # Logging in writes the session, so it is done before the clients
+        # start rather than counted as part of the burst.
+        clients = []
+        for _ in range(options['clients']):
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+
+        def client_run(number):
+            client = clients[number]
+            samples = []
+            errors = 0
+            try:
+                for index in range(options['posts']):
+                    started = time.perf_counter()
+                    try:
+                        response = client.post(url, {
+                            'text': f'Benchmark post {number}-{index}',
+                        })
+                    except Exception:
+                        errors += 1
+                        continue
+                    samples.append(time.perf_counter() - started)
+                    if response.status_code != 302:
+                        errors += 1
+            finally:
+                close_old_connections()
+            return samples, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['clients']) as pool:
+            results = list(pool.map(client_run, range(options['clients'])))
+        elapsed = time.perf_counter() - started
+        samples = [sample for run, _ in results for sample in run]
+        errors = sum(errors for _, errors in results)
+        return {
+            **summarize(samples),
+            'errors': errors,
+            'posts_per_second': round(len(samples) / elapsed, 1),
+        }
@@ -0,0 +1,87 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.benchmarks import database_info, summarize, write_report
+from core.management.commands.bench_urls import sample_objects
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+FEED = (
+    ('posts:index', ()),
+    ('posts:group_list', ('slug',)),
+    ('posts:profile', ('username',)),
+    ('posts:post_detail', ('post_id',)),
+)
+
+
+class Command(BaseCommand):
+    help = ('Compare session backends on authenticated feed traffic: '
+            'latency, queries per request and django_session queries.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--engines', nargs='*', choices=sorted(ENGINES),
+            default=sorted(ENGINES),
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        author, kwargs, _ = sample_objects()
+        urls = [
+            reverse(name, kwargs={key: kwargs[key] for key in keys})
+            for name, keys in FEED
+        ]
+        report = {
+            'database': database_info(),
+            'session_cache': settings.SESSION_CACHE_ALIAS,
+            'urls': urls,
+            'engines': {},
+        }
+        for name in options['engines']:
+            with override_settings(SESSION_ENGINE=ENGINES[name]):
+                report['engines'][name] = self.measure(author, urls, options)
+        write_report(self, report, options['output'])
+
+    def measure(self, user, urls, options):
+        client = Client()
+        client.force_login(user)
+        for _ in range(options['warmup']):
+            for url in urls:
+                client.get(url)
+        samples = []
+        queries = []
+        session_reads = 0
+        session_writes = 0
+        for _ in range(options['iterations']):
+            for url in urls:
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    client.get(url)
+                    samples.append(time.perf_counter() - started)
+                queries.append(len(captured))
+                for query in captured.captured_queries:
+                    if 'django_session' not in query['sql']:
+                        continue
+                    if query['sql'].startswith('SELECT'):
+                        session_reads += 1
+                    else:
+                        session_writes += 1
+        return {
+            **summarize(samples),
+            'queries_mean': round(statistics.mean(queries), 2),
+            'session_reads': session_reads,
+            'session_writes': session_writes,
+        }
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils import timezone
+
+from core.benchmarks import summarize, timed, write_report
+from core.template_warmup import project_template_names
+from posts.forms import PostForm
+from posts.models import Group, Post
+
+User = get_user_model()
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def build_engine(name, loaders):
+    params = dict(settings.TEMPLATES[0])
+    params.pop('BACKEND')
+    params.update({
+        'NAME': name,
+        'APP_DIRS': False,
+        'OPTIONS': {**params['OPTIONS'], 'loaders': loaders},
+    })
+    return DjangoTemplates(params)
+
+
+def sample_context():
+    author = User(
+        pk=1,
+        username='bench',
+        first_name='Bench',
+        last_name='Author',
+    )
+    group = Group(
+        pk=1,
+        slug='bench',
+        title='Bench group',
+        description='Group used to render templates in benchmarks',
+    )
+    post = Post(
+        pk=1,
+        text='Benchmark post text ' * 20,
+        author=author,
+        group=group,
+        pub_date=timezone.now(),
+    )
+    paginator = Paginator([post] * settings.COUNTLIST, settings.COUNTLIST)
+    form = PostForm()
+    form.fields['group'].queryset = Group.objects.none()
+    return {
+        'author': author,
+        'group': group,
+        'post': post,
+        'post_count': settings.COUNTLIST,
+        'page_obj': paginator.page(1),
+        'form': form,
+        'query': 'bench',
+    }
+
+
+class Command(BaseCommand):
+    help = ('Compare per-template render time of the default loaders with '
+            'the warmed cached loader of the production profile.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        before = build_engine('bench_default', LOADERS)
+        after = build_engine(
+            'bench_cached',
+            [('django.template.loaders.cached.Loader', LOADERS)]
+        )
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        context = sample_context()
+        report = {}
+        for name in sorted(project_template_names(before)):
+            def render_default():
+                before.get_template(name).render(context, request)
+
+            def render_cached():
+                after.get_template(name).render(context, request)
+
+            try:
+                render_cached()
+            except Exception as error:
+                report[name] = {'error': repr(error)}
+                continue
+            default = summarize(timed(render_default, iterations))
+            cached = summarize(timed(render_cached, iterations))
+            report[name] = {
+                'before': default,
+                'after': cached,
+                'speedup': round(default['mean_ms'] / cached['mean_ms'], 2),
+            }
+        write_report(self, report, options['output'])
@@ -0,0 +1,171 @@
+import statistics
+import time
+import tracemalloc
+from importlib import import_module
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.benchmarks import database_info, summarize, write_report
+from posts.models import Group, Post
+from posts.search import tokenize
+
+APPS = ('posts', 'about', 'users')
+
+# Extra query strings measured on top of the bare route.
+VARIANTS = {
+    'posts:index': ('?page=2', '?page=last'),
+    'posts:group_list': ('?page=2', '?page=last'),
+    'posts:profile': ('?page=2', '?page=last'),
+}
+
+
+def sample_objects():
+    post = Post.objects.select_related('author').first()
+    group = Group.objects.order_by('-post_count').first()
+    if post is None or group is None:
+        raise CommandError('Seed the database first, e.g. with seed_data.')
+    author = post.author
+    words = tokenize(post.text)
+    return author, {
+        'slug': group.slug,
+        'username': author.username,
+        'post_id': post.pk,
+        'uidb64': urlsafe_base64_encode(force_bytes(author.pk)),
+        'token': default_token_generator.make_token(author),
+    }, {
+        'posts:search': (f'?q={max(words, key=len)}',) if words else (),
+    }
+
+
+def route_urls(apps, kwargs, queries):
+    """URL of every named route of the apps, with their query variants."""
+    for app in apps:
+        module = import_module(f'{app}.urls')
+        namespace = getattr(module, 'app_name', app)
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = f'{namespace}:{pattern.name}'
+            url = reverse(name, kwargs={
+                key: kwargs[key] for key in pattern.pattern.converters
+            })
+            yield name, url
+            for query in VARIANTS.get(name, ()) + queries.get(name, ()):
+                yield name + query, url + query
+
+
+class Command(BaseCommand):
+    help = ('Measure latency, queries and allocations of every posts, about '
+            'and users route through the test client.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument(
+            '--alloc-iterations',
+            type=int,
+            default=5,
+            help='Requests per route traced with tracemalloc, which is too '
+                 'slow to leave on while timing.',
+        )
+        parser.add_argument(
+            '--authenticated',
+            action='store_true',
+            help='Log in as the author of the newest post.',
+        )
+        parser.add_argument(
+            '--routes',
+            nargs='*',
+            help='Only measure routes whose name contains one of these.',
+        )
+        parser.add_argument('--output', help='Write the JSON report here.')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        author, kwargs, queries = sample_objects()
+        client = Client()
+        self.user = author if options['authenticated'] else None
+        routes = {}
+        for name, url in route_urls(APPS, kwargs, queries):
+            if options['routes'] and not any(
+                part in name for part in options['routes']
+            ):
+                continue
+            if self.verbosity > 1:
+                self.stderr.write(f'Measuring {url}')
+            try:
+                routes[name] = self.measure(client, url, options)
+            except Exception as error:
+                # The test client re-raises view errors; a broken route is
+                # reported instead of stopping the whole run.
+                routes[name] = {'url': url, 'error': repr(error)}
+        write_report(self, {
+            'database': database_info(),
+            'authenticated': self.user is not None,
+            'iterations': options['iterations'],
+            'dataset': {
+                'posts': Post.objects.count(),
+                'groups': Group.objects.count(),
+                'authors': Post.objects.values('author').distinct().count(),
+            },
+            'routes': routes,
+        }, options['output'])
+
+    def ensure_login(self, client):
+        # Logging out drops the session, so the user is put back before
+        # every request, outside of the measured part.
+        if self.user is not None and '_auth_user_id' not in client.session:
+            client.force_login(self.user)
+
+    def measure(self, client, url, options):
+        for _ in range(options['warmup']):
+            self.ensure_login(client)
+            client.get(url)
+        samples = []
+        query_counts = []
+        for _ in range(options['iterations']):
+            self.ensure_login(client)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append(time.perf_counter() - started)
+            query_counts.append(len(captured))
+        report = {
+            'url': url,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            **summarize(samples),
+            'queries_mean': round(statistics.mean(query_counts), 2),
+            'queries_max': max(query_counts),
+        }
+        report.update(self.allocations(client, url, options))
+        return report
+
+    def allocations(self, client, url, options):
+        peaks = []
+        retained = []
+        for _ in range(options['alloc_iterations']):
+            self.ensure_login(client)
+            # Tracing starts afresh for every request, so the peak is the
+            # request's own; tracemalloc.reset_peak() needs Python 3.9.
+            tracemalloc.start()
+            try:
+                client.get(url)
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peaks.append(peak)
+            retained.append(current)
+        if not peaks:
+            return {}
+        return {
+            'alloc_peak_kb': round(statistics.median(peaks) / 1024, 1),
+            'alloc_retained_kb': round(statistics.median(retained) / 1024, 1),
+        }
@@ -0,0 +1,45 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = ('Delete expired database sessions in small batches, so writers '
+            'are never locked out for long. Run it periodically, e.g. '
+            'hourly from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.SESSION_CLEANUP_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Seconds to wait between batches.',
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not hasattr(engine.SessionStore, 'get_model_class'):
+            self.stdout.write(
+                'Sessions are not stored in the database, nothing to clear.'
+            )
+            return
+        model = engine.SessionStore.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now)
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not keys:
+                break
+            deleted += model.objects.filter(pk__in=keys).delete()[0]
+            time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired sessions.'
+        ))
@@ -0,0 +1,133 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Group, Post
+from posts.transfer import preserved_auto_now
+
+User = get_user_model()
+
+SEED_PASSWORD = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = ('Fill the database with a large fake dataset of groups, authors '
+            'and posts for benchmarks.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rows written per INSERT batch.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365 * 3,
+            help='Spread post dates over this many days before now.',
+        )
+        parser.add_argument('--locale', default='ru_RU')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['posts'] and options['authors'] < 1:
+            raise CommandError('Posts need at least one author.')
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.fake = Faker(options['locale'])
+        self.fake.seed_instance(options['seed'])
+        self.random = random.Random(options['seed'])
+        # Taking the run start as part of the names lets the command add
+        # another dataset on top of an earlier one.
+        self.prefix = f'seed{int(time.time())}'
+        started = time.perf_counter()
+        group_ids = self.create_groups(options['groups'])
+        author_ids = self.create_authors(options['authors'])
+        self.create_posts(
+            options['posts'], author_ids, [None] + group_ids,
+            timedelta(days=options['days'])
+        )
+        loaded = time.perf_counter() - started
+        rebuild = {'verbosity': self.verbosity, 'stdout': self.stdout}
+        call_command('recount_posts', **rebuild)
+        call_command('rebuild_search_index', **rebuild)
+        call_command('rebuild_timelines', **rebuild)
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(group_ids)} groups, {len(author_ids)} authors '
+            f'and {options["posts"]} posts in {loaded:.1f}s, '
+            f'{time.perf_counter() - started:.1f}s including rebuilds. '
+            f'Authors log in with the password "{SEED_PASSWORD}".'
+        ))
+
+    def bulk_create(self, model, objects):
+        # Django splits each batch further to fit the backend's limit on
+        # query parameters.
+        with transaction.atomic():
+            model.objects.bulk_create(objects)
+
+    def create_groups(self, total):
+        self.bulk_create(Group, [
+            Group(
+                slug=f'{self.prefix}-{i}',
+                title=self.fake.catch_phrase()[:200],
+                description=self.fake.paragraph(),
+            )
+            for i in range(total)
+        ])
+        return list(Group.objects.filter(
+            slug__startswith=f'{self.prefix}-'
+        ).values_list('pk', flat=True))
+
+    def create_authors(self, total):
+        # Hashing once keeps a million-user seed from taking hours.
+        password = make_password(SEED_PASSWORD)
+        self.bulk_create(User, [
+            User(
+                username=f'{self.prefix}_{i}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email(),
+                password=password,
+            )
+            for i in range(total)
+        ])
+        return list(User.objects.filter(
+            username__startswith=f'{self.prefix}_'
+        ).values_list('pk', flat=True))
+
+    def create_posts(self, total, author_ids, group_ids, period):
+        # Faker is slow per call; posts are stitched from a sentence pool.
+        sentences = [self.fake.sentence() for _ in range(1000)]
+        now = timezone.now()
+        seconds = period.total_seconds()
+        batch = []
+        with preserved_auto_now(Post, 'pub_date'):
+            for i in range(total):
+                batch.append(Post(
+                    author_id=self.random.choice(author_ids),
+                    group_id=self.random.choice(group_ids),
+                    text=' '.join(self.random.sample(
+                        sentences, self.random.randint(1, 8)
+                    )),
+                    pub_date=now - timedelta(
+                        seconds=self.random.uniform(0, seconds)
+                    ),
+                ))
+                if len(batch) >= self.batch_size:
+                    self.bulk_create(Post, batch)
+                    batch = []
+                    if self.verbosity > 1:
+                        self.stdout.write(f'{i + 1} posts created')
+            self.bulk_create(Post, batch)
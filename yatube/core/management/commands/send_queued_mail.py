@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mail import MailQueue
+
+
+class Command(BaseCommand):
+    help = ('Send the mail spooled by core.mail.QueuedEmailBackend in '
+            'batches over one connection, retrying failures with backoff.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds to wait for new mail once the queue is empty.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit when no due messages are left instead of waiting.',
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Queue again messages claimed this many seconds ago.',
+        )
+
+    def handle(self, *args, **options):
+        queue = MailQueue()
+        requeued = queue.requeue_stale(options['stale_after'])
+        if requeued:
+            self.stderr.write(f'Queued {requeued} stale messages again.')
+        try:
+            while True:
+                counts = queue.send_batch(options['batch_size'])
+                if any(counts.values()):
+                    report = queue.report()
+                    self.stdout.write(
+                        f'sent {counts["sent"]}, retried {counts["retried"]}'
+                        f', failed {counts["failed"]}; '
+                        f'{report["queue"]} queued, '
+                        f'latency {report["latency"]}'
+                    )
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Done: {queue.report()}'))
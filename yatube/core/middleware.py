@@ -0,0 +1,145 @@
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .benchmarks import summarize
+
+logger = logging.getLogger('yatube.timing')
+
+_local = threading.local()
+
+
+class RequestTimer:
+    """Costs of one request, filled in while it is being handled."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.total = 0.0
+        self.rendering = False
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ))
+
+
+def current_timer():
+    """Timer of the request handled by this thread, if it is sampled."""
+    return getattr(_local, 'timer', None)
+
+
+class ViewMetrics:
+    """Per-view totals of sampled requests, shared by the whole process."""
+
+    SAMPLES = 1000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.views = defaultdict(self.empty)
+            self.started = time.monotonic()
+
+    def empty(self):
+        return {
+            'requests': 0,
+            'queries': 0,
+            'db': 0.0,
+            'template': 0.0,
+            'total': deque(maxlen=self.SAMPLES),
+        }
+
+    def add(self, view_name, timer):
+        with self.lock:
+            view = self.views[view_name]
+            view['requests'] += 1
+            view['queries'] += timer.queries
+            view['db'] += timer.db
+            view['template'] += timer.template
+            view['total'].append(timer.total)
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                name: {
+                    'requests': view['requests'],
+                    'queries_mean': round(
+                        view['queries'] / view['requests'], 2
+                    ),
+                    'db_mean_ms': round(
+                        view['db'] / view['requests'] * 1000, 3
+                    ),
+                    'template_mean_ms': round(
+                        view['template'] / view['requests'] * 1000, 3
+                    ),
+                    **summarize(list(view['total'])),
+                }
+                for name, view in self.views.items()
+            }
+
+    def flush(self, interval):
+        """Log and reset the totals once ``interval`` seconds have passed."""
+        if time.monotonic() - self.started < interval:
+            return
+        report = self.as_dict()
+        self.reset()
+        for name, view in sorted(report.items()):
+            logger.info('%s %s', name, view)
+
+
+metrics = ViewMetrics()
+
+
+class RequestTimingMiddleware:
+    """Measure SQL, template and total time of a sample of requests.
+
+    The result is sent back in a ``Server-Timing`` header and added to
+    ``metrics`` under the resolved view name. REQUEST_TIMING_SAMPLE_RATE
+    is the share of requests measured; the rest only pay for one call to
+    ``random()``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timer = RequestTimer()
+        _local.timer = timer
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timer.execute)
+                    )
+                response = self.get_response(request)
+        finally:
+            _local.timer = None
+        timer.total = time.perf_counter() - started
+        response['Server-Timing'] = timer.server_timing()
+        match = request.resolver_match
+        metrics.add(match.view_name if match else '<unresolved>', timer)
+        metrics.flush(settings.REQUEST_TIMING_LOG_INTERVAL)
+        return response
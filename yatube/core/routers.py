@@ -0,0 +1,96 @@
+import random
+import threading
+
+from django.conf import settings
+
+_state = threading.local()
+
+PIN_COOKIE = 'primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def use_replica(view):
+    """Let GET requests to the view read from DATABASE_REPLICAS."""
+    view.use_replica = True
+    return view
+
+
+def current_replica():
+    """Replica chosen for the current request, or None to use default."""
+    return getattr(_state, 'replica', None)
+
+
+def load_user(request):
+    """Evaluate the lazy request.user, reading the session and the user."""
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_authenticated
+
+
+def session_changed(request):
+    session = getattr(request, 'session', None)
+    return session is not None and session.modified
+
+
+class ReplicaRouter:
+    """Send reads of replica-enabled views to a replica, the rest to default.
+
+    Writes, and every read outside of views marked with ``use_replica``,
+    go to ``default``. Replicas are not migrated: replication, or the
+    ``sync_replicas`` command for local SQLite files, copies the schema.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Turn replica reads on for the views that allow them.
+
+    A request that may have written anything, or that changed the
+    session as logging in and out do, sets a short-lived cookie, and
+    requests carrying it read from the primary. That way an author sees
+    their new post even if the replicas are lagging behind. The session
+    and the user are loaded from the primary before a replica is picked,
+    so a lagging replica cannot bring back a session that was deleted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.replica = None
+        if request.method not in SAFE_METHODS or session_changed(request):
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _state.replica = None
+        # One replica serves the whole request, so all of its reads see
+        # the same point of the replication stream.
+        if (
+            settings.DATABASE_REPLICAS
+            and getattr(view_func, 'use_replica', False)
+            and request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            load_user(request)
+            _state.replica = random.choice(settings.DATABASE_REPLICAS)
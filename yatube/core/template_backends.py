@@ -0,0 +1,34 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from .middleware import current_timer
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timer = current_timer()
+        if timer is None or timer.rendering:
+            return super().render(context, request)
+        timer.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer.template += time.perf_counter() - started
+            timer.rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django templates reporting render time to RequestTimingMiddleware.
+
+    Templates rendered while another one is being rendered, such as
+    cached post cards, are counted as part of the outer template.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
@@ -0,0 +1,40 @@
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.template import engines
+
+
+def project_template_dirs(engine):
+    """Template directories of the project, skipping third-party apps."""
+    dirs = list(engine.engine.dirs)
+    for app_config in apps.get_app_configs():
+        directory = os.path.join(app_config.path, 'templates')
+        if (
+            app_config.path.startswith(settings.BASE_DIR)
+            and os.path.isdir(directory)
+        ):
+            dirs.append(directory)
+    return dirs
+
+
+def project_template_names(engine):
+    for directory in project_template_dirs(engine):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Compile every project template so the cached loader keeps it.
+
+    Returns the number of templates loaded.
+    """
+    loaded = 0
+    for engine in engines.all():
+        for name in project_template_names(engine):
+            engine.get_template(name)
+            loaded += 1
+    return loaded
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..asgi import WsgiToAsgi, build_environ
+
+User = get_user_model()
+
+
+def call(application, scope, body=b''):
+    """Run one ASGI request, returning the messages the app sent."""
+    messages = []
+    chunks = [
+        {'type': 'http.request', 'body': body[:1], 'more_body': True},
+        {'type': 'http.request', 'body': body[1:]},
+    ]
+
+    async def receive():
+        return chunks.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return messages
+
+
+def http_scope(path, method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver'), *headers],
+    }
+
+
+class WsgiToAsgiTest(TransactionTestCase):
+    # Views run on pool threads with their own connections, which only
+    # see committed rows.
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='TestName')
+        self.post = Post.objects.create(author=self.user, text='Test text')
+        self.application = WsgiToAsgi(WSGIHandler(), max_workers=2)
+
+    def tearDown(self):
+        self.application.executor.shutdown()
+
+    def test_feed_views_are_served(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': self.user}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                start, body = call(self.application, http_scope(address))
+                self.assertEqual(start['status'], 200)
+                self.assertIn(
+                    (b'content-type', b'text/html; charset=utf-8'),
+                    start['headers']
+                )
+                self.assertIn('Test text', body['body'].decode())
+
+    def test_query_string_and_body_reach_the_view(self):
+        start, body = call(self.application, http_scope(
+            reverse('posts:search'),
+            query_string='q=текст'.encode(),
+        ))
+        self.assertEqual(start['status'], 200)
+        self.assertIn('value="текст"', body['body'].decode())
+        start, body = call(self.application, http_scope(
+            reverse('users:login'),
+            method='POST',
+            headers=[
+                (b'content-type', b'application/x-www-form-urlencoded'),
+            ],
+        ), body=b'username=TestName&password=wrong')
+        # The CSRF check reads the body, so a rejection proves it arrived.
+        self.assertEqual(start['status'], 403)
+
+    def test_lifespan(self):
+        messages = []
+        events = [
+            {'type': 'lifespan.startup'},
+            {'type': 'lifespan.shutdown'},
+        ]
+
+        async def receive():
+            return events.pop(0)
+
+        async def send(message):
+            messages.append(message['type'])
+
+        asyncio.run(self.application({'type': 'lifespan'}, receive, send))
+        self.assertEqual(messages, [
+            'lifespan.startup.complete',
+            'lifespan.shutdown.complete',
+        ])
+
+    def test_repeated_headers_are_joined(self):
+        environ = build_environ(http_scope('/', headers=[
+            (b'cookie', b'a=1'),
+            (b'cookie', b'b=2'),
+            (b'content-length', b'3'),
+        ]), b'abc')
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['CONTENT_LENGTH'], '3')
+        self.assertEqual(environ['wsgi.input'].read(), b'abc')
+
+    def test_bench_asgi_compares_equal_parallelism(self):
+        out = StringIO()
+        call_command('bench_asgi', requests=4, concurrency=2,
+                     asgi_threads=2, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['wsgi_workers'], 2)
+        self.assertEqual(report['asgi_threads'], 2)
+        for run in ('wsgi', 'asgi'):
+            self.assertEqual(report[run]['statuses'], {'200': 4})
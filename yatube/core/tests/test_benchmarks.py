@@ -0,0 +1,79 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts.models import AuthorStats, Group, Post, TimelineEntry
+
+User = get_user_model()
+
+
+class BenchmarkCommandsTest(TestCase):
+    def test_seed_data(self):
+        call_command('seed_data', posts=30, authors=3, groups=2,
+                     batch_size=7, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(
+            sum(AuthorStats.objects.values_list('post_count', flat=True)),
+            30
+        )
+        self.assertEqual(
+            TimelineEntry.objects.filter(
+                kind=TimelineEntry.AUTHOR
+            ).count(),
+            30
+        )
+
+    def test_bench_urls_reports_every_route(self):
+        call_command('seed_data', posts=15, authors=2, groups=1,
+                     stdout=StringIO())
+        out = StringIO()
+        call_command('bench_urls', iterations=2, warmup=0,
+                     alloc_iterations=1, authenticated=True, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertTrue(report['authenticated'])
+        self.assertEqual(report['dataset']['posts'], 15)
+        for name in ('posts:index', 'posts:post_edit', 'about:tech',
+                     'users:login'):
+            with self.subTest(name=name):
+                route = report['routes'][name]
+                self.assertEqual(route['status'], 200)
+                self.assertEqual(route['count'], 2)
+                self.assertIn('p99_ms', route)
+                self.assertIn('queries_max', route)
+                self.assertIn('alloc_peak_kb', route)
+
+    def test_bench_context_processors(self):
+        out = StringIO()
+        call_command('bench_context_processors', iterations=5, renders=2,
+                     stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['renders_per_page'], 2)
+        self.assertIn('before_us', report['year'])
+        self.assertIn('saved_per_page_us', report)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_bench_logins(self):
+        out = StringIO()
+        call_command('bench_logins', logins=2, pbkdf2=[1000, 500],
+                     stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['login']['count'], 2)
+        self.assertEqual(set(report['pbkdf2']), {'1000', '500'})
+        self.assertFalse(User.objects.filter(username='bench-login').exists())
+
+    def test_bench_sessions(self):
+        call_command('seed_data', posts=5, authors=1, groups=1,
+                     stdout=StringIO())
+        out = StringIO()
+        call_command('bench_sessions', iterations=1, warmup=1, stdout=out)
+        engines = json.loads(out.getvalue())['engines']
+        self.assertEqual(engines['db']['session_reads'], 4)
+        for name in ('cached_db', 'signed_cookies'):
+            with self.subTest(engine=name):
+                self.assertEqual(engines[name]['session_reads'], 0)
+                self.assertEqual(engines[name]['session_writes'], 0)
@@ -0,0 +1,25 @@
+import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from ..context_processors import year
+
+
+class YearTest(SimpleTestCase):
+    def test_year_is_kept_until_new_year(self):
+        with mock.patch.dict(year._current, {'year': None, 'until': 0.0}):
+            self.assertEqual(
+                year.year(None)['year'], timezone.localtime().year
+            )
+            with mock.patch.object(year.timezone, 'localtime') as localtime:
+                year.year(None)
+                localtime.assert_not_called()
+
+    def test_next_new_year(self):
+        now = datetime.datetime(2020, 12, 31, 23, 59, tzinfo=timezone.utc)
+        self.assertEqual(
+            year.next_new_year(now),
+            datetime.datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp()
+        )
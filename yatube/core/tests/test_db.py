@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from ..db import check_connections
+
+PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+@override_settings(SQLITE_PRAGMAS=PRAGMAS)
+class SqlitePragmasTest(SimpleTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.connection = DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': os.path.join(self.temp_dir, 'db.sqlite3'),
+        }, alias='pragmas')
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def pragma(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_new_connections_are_tuned(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('mmap_size'), 1024 * 1024)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+
+
+class FakeConnection:
+    def __init__(self, conn_max_age, usable):
+        self.settings_dict = {'CONN_MAX_AGE': conn_max_age}
+        self.connection = object()
+        self.usable = usable
+        self.closed = False
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.closed = True
+
+
+class HealthCheckTest(SimpleTestCase):
+    def test_only_dead_persistent_connections_are_closed(self):
+        dead = FakeConnection(conn_max_age=60, usable=False)
+        alive = FakeConnection(conn_max_age=60, usable=True)
+        per_request = FakeConnection(conn_max_age=0, usable=False)
+        with mock.patch.object(
+            connections, 'all', return_value=[dead, alive, per_request]
+        ):
+            check_connections()
+        self.assertTrue(dead.closed)
+        self.assertFalse(alive.closed)
+        self.assertFalse(per_request.closed)
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+
+@override_settings(
+    PASSWORD_HASHERS=['core.hashers.TunedPBKDF2PasswordHasher'],
+    PASSWORD_HASH_ITERATIONS=1000,
+)
+class TunedHasherTest(TestCase):
+    def test_iterations_come_from_settings(self):
+        user = User.objects.create_user('reader', password='secret-pass')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_login_rehashes_with_new_iterations(self):
+        User.objects.create_user('reader', password='secret-pass')
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.client.post(reverse('users:login'), {
+                'username': 'reader',
+                'password': 'secret-pass',
+            })
+        user = User.objects.get(username='reader')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(user.check_password('secret-pass'))
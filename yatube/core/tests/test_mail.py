@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..mail import QUEUED, SENDING, MailQueue, queue_depth
+
+User = get_user_model()
+
+LOCMEM = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('Mail server is down')
+
+
+class QueuedMailTest(TestCase):
+    def setUp(self):
+        self.spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool)
+        settings = override_settings(
+            EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+            EMAIL_QUEUE_BACKEND=LOCMEM,
+            EMAIL_QUEUE_PATH=self.spool,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        User.objects.create_user(
+            'reader', email='reader@example.com', password='secret-pass'
+        )
+
+    def reset_password(self):
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'reader@example.com'}
+        )
+
+    def test_password_reset_only_queues_mail(self):
+        self.reset_password()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(queue_depth(), {'queue': 1, 'failed': 0})
+        out = StringIO()
+        call_command('send_queued_mail', once=True, stdout=out)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        self.assertIn('/reset/', mail.outbox[0].body)
+        self.assertEqual(queue_depth(), {'queue': 0, 'failed': 0})
+        self.assertIn('sent 1, retried 0, failed 0', out.getvalue())
+
+    @override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=2)
+    def test_failed_mail_is_retried_with_backoff(self):
+        self.reset_password()
+        queue = MailQueue('core.tests.test_mail.FailingBackend')
+        self.assertEqual(
+            queue.send_batch(10), {'sent': 0, 'retried': 1, 'failed': 0}
+        )
+        # The retry is not due yet.
+        self.assertEqual(
+            queue.send_batch(10), {'sent': 0, 'retried': 0, 'failed': 0}
+        )
+        self.assertEqual(queue_depth(), {'queue': 1, 'failed': 0})
+        with override_settings(EMAIL_QUEUE_RETRY_DELAY=0):
+            queue.retry(*self.claim_one())
+        self.assertEqual(queue_depth(), {'queue': 0, 'failed': 1})
+
+    def claim_one(self):
+        """Claim the queued message even though its retry is not due."""
+        queued = os.path.join(self.spool, QUEUED)
+        name = os.listdir(queued)[0]
+        path = os.path.join(self.spool, SENDING, name)
+        os.replace(os.path.join(queued, name), path)
+        with open(path) as spool_file:
+            return path, json.load(spool_file)
+
+    def test_stale_claims_are_queued_again(self):
+        self.reset_password()
+        queue = MailQueue()
+        self.assertEqual(len(queue.claim(10)), 1)
+        self.assertEqual(queue_depth()['queue'], 0)
+        self.assertEqual(queue.requeue_stale(0), 1)
+        self.assertEqual(queue.send_batch(10)['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_report_keeps_recent_latencies_only(self):
+        self.reset_password()
+        self.reset_password()
+        with mock.patch.object(MailQueue, 'SAMPLES', 1):
+            queue = MailQueue()
+        self.assertEqual(queue.send_batch(10)['sent'], 2)
+        self.assertEqual(queue.report()['latency']['count'], 1)
@@ -0,0 +1,69 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..middleware import metrics
+
+User = get_user_model()
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), '
+    r'total;dur=[\d.]+$'
+)
+
+
+class RequestTimingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.staff = User.objects.create_user(
+            username='StaffName', is_staff=True
+        )
+        Post.objects.create(author=cls.user, text='Test text')
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('posts:index'))
+        timing = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(timing, response['Server-Timing'])
+        self.assertEqual(int(timing.group(1)), 1)
+        self.assertGreater(float(timing.group(2)), 0)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(metrics.as_dict(), {})
+
+    def test_metrics_are_grouped_by_view_name(self):
+        for _ in range(3):
+            self.client.get(reverse('posts:index'))
+        self.client.get(reverse('about:tech'))
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('request_metrics'))
+        report = response.json()
+        self.assertEqual(report['posts:index']['requests'], 3)
+        self.assertEqual(report['posts:index']['queries_mean'], 1)
+        self.assertEqual(report['about:tech']['requests'], 1)
+        self.assertIn('p95_ms', report['posts:index'])
+
+    def test_metrics_are_for_staff_only(self):
+        response = self.client.get(reverse('request_metrics'))
+        self.assertEqual(response.status_code, 404)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('request_metrics'))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(REQUEST_TIMING_LOG_INTERVAL=0)
+    def test_metrics_are_logged_and_reset(self):
+        with self.assertLogs('yatube.timing', 'INFO') as logs:
+            self.client.get(reverse('posts:index'))
+        self.assertIn('posts:index', logs.output[0])
+        self.assertEqual(metrics.as_dict(), {})
@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..routers import (PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware,
+                       use_replica)
+
+User = get_user_model()
+
+router = ReplicaRouter()
+
+
+@use_replica
+def replica_view(request):
+    return HttpResponse(router.db_for_read(Post) or 'default')
+
+
+@use_replica
+def two_reads_view(request):
+    return HttpResponse(
+        f'{router.db_for_read(Post)} {router.db_for_read(User)}'
+    )
+
+
+def primary_view(request):
+    return HttpResponse(router.db_for_read(Post) or 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def serve(self, request, view):
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_marked_views_read_from_replica(self):
+        response = self.serve(self.factory.get('/'), replica_view)
+        self.assertEqual(response.content, b'replica')
+        self.assertIsNone(router.db_for_read(Post))
+
+    def test_other_views_read_from_primary(self):
+        response = self.serve(self.factory.get('/'), primary_view)
+        self.assertEqual(response.content, b'default')
+
+    def test_writes_pin_client_to_primary(self):
+        response = self.serve(self.factory.post('/'), replica_view)
+        self.assertEqual(response.content, b'default')
+        self.assertIn(PIN_COOKIE, response.cookies)
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        response = self.serve(request, replica_view)
+        self.assertEqual(response.content, b'default')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_writes_and_migrations_go_to_primary(self):
+        self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertTrue(router.allow_migrate('default', 'posts'))
+        self.assertFalse(router.allow_migrate('replica', 'posts'))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_default(self):
+        response = self.serve(self.factory.get('/'), replica_view)
+        self.assertEqual(response.content, b'default')
+
+    @override_settings(DATABASE_REPLICAS=[f'replica{i}' for i in range(20)])
+    def test_one_replica_serves_the_whole_request(self):
+        for _ in range(5):
+            response = self.serve(self.factory.get('/'), two_reads_view)
+            first, second = response.content.decode().split()
+            self.assertEqual(first, second)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaViewTest(TransactionTestCase):
+    """The replica alias mirrors default in tests, so it sees its rows."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='TestName')
+        Post.objects.create(author=self.user, text='Test text')
+
+    def get_index(self):
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections['replica']) as replica:
+                response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Test text')
+        return (
+            [query['sql'] for query in primary.captured_queries],
+            [query['sql'] for query in replica.captured_queries],
+        )
+
+    def test_feed_reads_from_replica(self):
+        primary, replica = self.get_index()
+        self.assertEqual(primary, [])
+        self.assertNotEqual(replica, [])
+
+    def test_pinned_client_reads_from_primary(self):
+        self.client.cookies[PIN_COOKIE] = '1'
+        primary, replica = self.get_index()
+        self.assertNotEqual(primary, [])
+        self.assertEqual(replica, [])
+
+    def test_session_and_user_are_read_from_primary(self):
+        self.client.force_login(self.user)
+        primary, replica = self.get_index()
+        self.assertTrue(any('django_session' in sql for sql in primary))
+        self.assertTrue(any('auth_user' in sql for sql in primary))
+        self.assertFalse(any('django_session' in sql for sql in replica))
+        self.assertNotEqual(replica, [])
+
+    def test_logout_pins_client_to_primary(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('users:logout'))
+        self.assertIn(PIN_COOKIE, response.cookies)
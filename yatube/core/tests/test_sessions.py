@@ -0,0 +1,36 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+
+class ClearExpiredSessionsTest(TestCase):
+    def test_expired_sessions_are_deleted_in_batches(self):
+        now = timezone.now()
+        Session.objects.bulk_create([
+            Session(
+                session_key=f'key{number}',
+                session_data='',
+                expire_date=now + timedelta(days=1 if number < 2 else -1),
+            )
+            for number in range(7)
+        ])
+        out = StringIO()
+        call_command('clear_expired_sessions', batch_size=2, pause=0,
+                     stdout=out)
+        self.assertIn('Deleted 5 expired sessions.', out.getvalue())
+        self.assertEqual(
+            set(Session.objects.values_list('pk', flat=True)),
+            {'key0', 'key1'}
+        )
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'
+    )
+    def test_cookie_sessions_need_no_cleanup(self):
+        out = StringIO()
+        call_command('clear_expired_sessions', stdout=out)
+        self.assertIn('nothing to clear', out.getvalue())
@@ -0,0 +1,10 @@
+from django.http import Http404, JsonResponse
+
+from .middleware import metrics
+
+
+def request_metrics(request):
+    """Aggregated RequestTimingMiddleware metrics, for staff users only."""
+    if not request.user.is_staff:
+        raise Http404
+    return JsonResponse(metrics.as_dict(), json_dumps_params={'indent': 2})
@@ -0,0 +1,275 @@
+import datetime
+import hashlib
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.cache import patch_cache_control
+from django.utils.encoding import force_bytes
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition
+
+from core.routers import current_replica
+
+from .models import Post
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+INDEX_SCOPE = 'index'
+GROUP_SCOPE = 'group:{slug}'
+PROFILE_SCOPE = 'profile:{username}'
+POST_SCOPE = 'post:{post_id}'
+
+TOTAL_POSTS_KEY = 'post-total'
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+card_stats = CacheStats()
+page_stats = CacheStats()
+
+
+def card_cache():
+    return caches[settings.POST_CARD_CACHE]
+
+
+def card_key(post, show_group):
+    # The author and group are part of the card but not of the post, so
+    # what the card shows of them is keyed directly.
+    group_slug = post.group.slug if show_group and post.group_id else ''
+    return 'post-card:{}:{}:{}:{}:{:d}:{}'.format(
+        post.pk,
+        post.version,
+        post.pub_date.timestamp(),
+        translation.get_language(),
+        show_group,
+        digest((
+            post.author.username,
+            post.author.get_full_name(),
+            group_slug,
+        )),
+    )
+
+
+def render_card(post, show_group=True):
+    """Rendered card markup, taken from the cache when the version matches.
+
+    Saving a post with a new text or group bumps its version, and renaming
+    its author or group changes the key too; stale entries are left for the
+    backend to evict.
+    """
+    cache = card_cache()
+    key = card_key(post, show_group)
+    html = cache.get(key)
+    if html is not None:
+        card_stats.hit()
+        return mark_safe(html)
+    card_stats.miss()
+    html = render_to_string(CARD_TEMPLATE, {
+        'post': post,
+        'show_group': show_group,
+    })
+    cache.set(key, str(html), None)
+    return html
+
+
+def page_cache():
+    return caches[settings.POST_PAGE_CACHE]
+
+
+def digest(value):
+    return hashlib.md5(force_bytes(value)).hexdigest()
+
+
+def scope_cache():
+    """Cache of the scope tokens and the post total.
+
+    Every process serving the site must share it: a write in one process
+    has to change the ETags and totals the others answer with.
+    """
+    return caches[settings.POST_SCOPE_CACHE]
+
+
+def total_posts():
+    """Number of posts, kept up to date on writes and counted again every
+    POST_TOTAL_TIMEOUT seconds to catch bulk loads and drift."""
+    cache = scope_cache()
+    total = cache.get(TOTAL_POSTS_KEY)
+    if total is None:
+        total = Post.objects.count()
+        cache.set(TOTAL_POSTS_KEY, total, settings.POST_TOTAL_TIMEOUT)
+    return total
+
+
+def change_total_posts(delta):
+    try:
+        scope_cache().incr(TOTAL_POSTS_KEY, delta)
+    except ValueError:
+        pass
+
+
+def scope_key(scope):
+    return f'feed-scope:{digest(scope)}'
+
+
+def scope_tokens(*scopes):
+    """Current token of every scope, starting new scopes from now."""
+    cache = scope_cache()
+    keys = [scope_key(scope) for scope in scopes]
+    tokens = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in tokens}
+    if missing:
+        cache.set_many(missing, None)
+        tokens.update(missing)
+    return [tokens[key] for key in keys]
+
+
+def bump_scopes(*scopes):
+    """Move the scopes to new tokens, orphaning every page cached under
+    the old ones."""
+    now = time.time()
+    scope_cache().set_many(
+        {scope_key(scope): now for scope in scopes if scope},
+        None
+    )
+
+
+def replica_may_lag(*tokens):
+    """Whether the request reads from a replica that may not have caught up
+    with the newest of the tokens yet.
+
+    Such a page may show data older than the token, so it is neither cached
+    nor given validators under it.
+    """
+    return (
+        current_replica() is not None
+        and time.time() - max(tokens) < settings.DATABASE_REPLICA_PIN_SECONDS
+    )
+
+
+def page_key(request, scope, token):
+    return 'feed-page:{}:{}:{}:{}'.format(
+        digest(scope),
+        token,
+        translation.get_language(),
+        digest(request.get_full_path()),
+    )
+
+
+def cache_anonymous_page(scope_format):
+    """Serve the view from the page cache to anonymous GET requests.
+
+    ``scope_format`` is formatted with the view kwargs to name the scope
+    whose token the cached pages are keyed by, e.g. ``GROUP_SCOPE``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                not settings.POST_PAGE_CACHE_ENABLED
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            scope = scope_format.format(**kwargs)
+            token, = scope_tokens(scope)
+            if replica_may_lag(token):
+                return view(request, *args, **kwargs)
+            key = page_key(request, scope, token)
+            cache = page_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                page_stats.hit()
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            page_stats.miss()
+            response = view(request, *args, **kwargs)
+            if (
+                response.status_code == HTTPStatus.OK
+                and not response.streaming
+            ):
+                cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    None
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def page_validators(request, scopes, kwargs):
+    """ETag and Last-Modified of a page built from the given scopes.
+
+    Both come from the scope tokens alone, so answering a conditional
+    request costs no database query beyond what ``scopes`` itself needs.
+    """
+    if not hasattr(request, '_page_validators'):
+        if callable(scopes):
+            names = scopes(request, **kwargs)
+        else:
+            names = [scopes.format(**kwargs)]
+        request._page_validators = (None, None)
+        tokens = scope_tokens(*names) if names else None
+        if tokens and not replica_may_lag(*tokens):
+            etag = digest(repr((
+                tokens,
+                request.user.pk,
+                request.get_full_path(),
+                translation.get_language(),
+            )))
+            last_modified = datetime.datetime.fromtimestamp(
+                max(tokens), datetime.timezone.utc
+            )
+            request._page_validators = (etag, last_modified)
+    return request._page_validators
+
+
+def conditional_page(scopes):
+    """Answer conditional GETs with 304 before the view renders anything.
+
+    ``scopes`` is a scope format string or a callable returning the list
+    of scopes the page depends on; an empty list disables validators.
+    """
+    def etag(request, *args, **kwargs):
+        return page_validators(request, scopes, kwargs)[0]
+
+    def last_modified(request, *args, **kwargs):
+        return page_validators(request, scopes, kwargs)[1]
+
+    def decorator(view):
+        @wraps(view)
+        @condition(etag_func=etag, last_modified_func=last_modified)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
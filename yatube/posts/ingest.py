@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .cache import TOTAL_POSTS_KEY, scope_cache
+
+
+class PostWriter:
+    """Thread committing new posts in micro-batches.
+
+    Every post is still saved with ``save()``, inside a savepoint of the
+    batch transaction, so the post signals run as usual and one invalid
+    post does not fail the others. A batch failing at commit, on a deferred
+    constraint for instance, is written again one post at a time. A future
+    is resolved only once its post is committed, so whoever waits on it
+    can read the post back; a post whose future was cancelled while it
+    was queued is skipped.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, post):
+        future = Future()
+        self.queue.put((post, future))
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='post-writer', daemon=True
+                )
+                self.thread.start()
+        return future
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + settings.POST_WRITE_BEHIND_MAX_DELAY
+            while len(batch) < settings.POST_WRITE_BEHIND_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get(
+                        timeout=max(0, deadline - time.monotonic())
+                    ))
+                except queue.Empty:
+                    break
+            self.write(batch)
+
+    def write(self, batch):
+        close_old_connections()
+        results = []
+        try:
+            with transaction.atomic():
+                for post, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic():
+                            post.save()
+                    except Exception as error:
+                        # The post_save receivers may have counted the post
+                        # before the savepoint was rolled back.
+                        scope_cache().delete(TOTAL_POSTS_KEY)
+                        results.append((future, error))
+                    else:
+                        results.append((future, None))
+        except Exception:
+            self.write_each(batch)
+            return
+        for future, error in results:
+            if error is None:
+                future.set_result(True)
+            else:
+                future.set_exception(error)
+
+    def write_each(self, batch):
+        # The rolled back batch already counted its posts in the cached
+        # total, so it is counted again from the database.
+        scope_cache().delete(TOTAL_POSTS_KEY)
+        for post, future in batch:
+            if future.cancelled():
+                continue
+            post.pk = None
+            post._state.adding = True
+            try:
+                with transaction.atomic():
+                    post.save()
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(True)
+
+
+post_writer = PostWriter()
+
+
+def save_new_post(post):
+    """Save a post created by a request, through the writer if enabled.
+
+    A post still queued after POST_WRITE_BEHIND_TIMEOUT seconds is taken
+    back from the writer and saved by the request itself. One the writer
+    has already started on is waited for until it is committed, so a post
+    is never saved twice.
+    """
+    if not settings.POST_WRITE_BEHIND:
+        post.save()
+        return
+    future = post_writer.submit(post)
+    try:
+        future.result(settings.POST_WRITE_BEHIND_TIMEOUT)
+    except TimeoutError:
+        if not future.cancel():
+            future.result()
+            return
+        post.save()
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import WRITERS, export_records
+
+
+class Command(BaseCommand):
+    help = ('Stream groups, post authors and posts to NDJSON or CSV in '
+            'constant memory.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            nargs='?',
+            default='-',
+            help='File to write, or "-" for standard output.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=sorted(WRITERS),
+            default='ndjson',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows fetched from the database at a time.',
+        )
+
+    def handle(self, *args, **options):
+        write = WRITERS[options['format']]
+        records = export_records(options['batch_size'])
+        started = time.perf_counter()
+        if options['output'] == '-':
+            rows = write(records, self.stdout)
+        else:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as stream:
+                rows = write(records, stream)
+        elapsed = time.perf_counter() - started
+        # The report goes to stderr so it never ends up in piped output.
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {rows} rows in {elapsed:.2f}s '
+            f'({rows / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
@@ -0,0 +1,87 @@
+import sys
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.cache import GROUP_SCOPE, INDEX_SCOPE, PROFILE_SCOPE, bump_scopes
+from posts.transfer import (AUTHOR, GROUP, POST, READERS, Importer,
+                            TransferError)
+
+
+class Command(BaseCommand):
+    help = ('Load groups, authors and posts written by export_posts with '
+            'batched bulk inserts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input',
+            help='File to read, or "-" for standard input.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help='Input format; guessed from the file extension by default.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows written per INSERT batch.',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        path = options['input']
+        input_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'ndjson'
+        )
+        importer = Importer(options['batch_size'])
+        started = time.perf_counter()
+        rows = 0
+        if path == '-':
+            rows = self.load(importer, READERS[input_format](sys.stdin))
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                rows = self.load(importer, READERS[input_format](stream))
+        loaded = time.perf_counter() - started
+        self.rebuild(importer)
+        elapsed = time.perf_counter() - started
+        created = importer.created
+        self.stdout.write(self.style.SUCCESS(
+            f'Read {rows} rows and created {created[GROUP]} groups, '
+            f'{created[AUTHOR]} authors and {created[POST]} posts in '
+            f'{loaded:.2f}s ({rows / max(loaded, 1e-9):.0f} rows/s); '
+            f'{elapsed:.2f}s including rebuilds.'
+        ))
+
+    def load(self, importer, records):
+        rows = 0
+        try:
+            for rows, values in enumerate(records, 1):
+                importer.add(values)
+                if self.verbosity > 1 and rows % importer.batch_size == 0:
+                    self.stdout.write(f'{rows} rows read')
+            importer.finish()
+        except (TransferError, ValueError, KeyError) as error:
+            raise CommandError(f'Import stopped at row {rows}: {error}')
+        return rows
+
+    def rebuild(self, importer):
+        """Do once for the new posts what the skipped post_save receivers
+        do per row."""
+        options = {
+            'after_pk': importer.after_pk,
+            'verbosity': self.verbosity,
+            'stdout': self.stdout,
+        }
+        call_command('recount_posts', **options)
+        call_command('rebuild_search_index', **options)
+        call_command('rebuild_timelines', **options)
+        bump_scopes(
+            INDEX_SCOPE,
+            *(GROUP_SCOPE.format(slug=slug)
+              for slug in importer.touched_groups),
+            *(PROFILE_SCOPE.format(username=username)
+              for username in importer.touched_authors),
+        )
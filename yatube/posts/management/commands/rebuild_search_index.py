@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of posts from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts indexed per INSERT batch.',
+        )
+        parser.add_argument(
+            '--after-pk',
+            type=int,
+            help='Only rebuild posts with a greater id, e.g. new imports.',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_index(options['batch_size'], options['after_pk'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the {type(get_backend()).__name__} search index.'
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import TimelineEntry
+from posts.timelines import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the author and group timelines of posts from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of timeline entries written per INSERT batch.',
+        )
+        parser.add_argument(
+            '--after-pk',
+            type=int,
+            help='Only rebuild posts with a greater id, e.g. new imports.',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_timelines(options['batch_size'], options['after_pk'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {TimelineEntry.objects.count()} timeline entries.'
+        ))
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from posts.cache import TOTAL_POSTS_KEY, scope_cache
+from posts.models import AuthorStats, Group, Post
+
+
+class Command(BaseCommand):
+    help = 'Repair drift in the per-author and per-group post counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of counters written per UPDATE batch.',
+        )
+        parser.add_argument(
+            '--after-pk',
+            type=int,
+            help=('Only recount the authors and groups of posts with a '
+                  'greater id, e.g. new imports.'),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        groups = Group.objects.all()
+        authors = AuthorStats.objects.all()
+        posts = Post.objects.order_by()
+        if options['after_pk'] is not None:
+            new_posts = Post.objects.filter(pk__gt=options['after_pk'])
+            groups = groups.filter(pk__in=new_posts.values('group_id'))
+            authors = authors.filter(user__in=new_posts.values('author_id'))
+            posts = posts.filter(author__in=new_posts.values('author_id'))
+        with transaction.atomic():
+            fixed_groups = self.recount_groups(groups, batch_size)
+            fixed_authors = self.recount_authors(authors, posts, batch_size)
+        scope_cache().delete(TOTAL_POSTS_KEY)
+        self.stdout.write(self.style.SUCCESS(
+            f'Fixed {fixed_groups} group and {fixed_authors} author '
+            f'counters.'
+        ))
+
+    def recount_groups(self, groups, batch_size):
+        drifted = [
+            Group(pk=pk, post_count=actual)
+            for pk, actual in groups.annotate(
+                actual=Count('posts')
+            ).exclude(post_count=F('actual')).values_list('pk', 'actual')
+        ]
+        Group.objects.bulk_update(drifted, ['post_count'], batch_size)
+        return len(drifted)
+
+    def recount_authors(self, authors, posts, batch_size):
+        actual = dict(
+            posts.values_list('author').annotate(total=Count('pk'))
+        )
+        stored = dict(authors.values_list('user_id', 'post_count'))
+        drifted = [
+            AuthorStats(user_id=user_id, post_count=actual.get(user_id, 0))
+            for user_id, post_count in stored.items()
+            if actual.get(user_id, 0) != post_count
+        ]
+        missing = [
+            AuthorStats(user_id=user_id, post_count=post_count)
+            for user_id, post_count in actual.items()
+            if user_id not in stored
+        ]
+        AuthorStats.objects.bulk_update(drifted, ['post_count'], batch_size)
+        AuthorStats.objects.bulk_create(missing, batch_size)
+        return len(drifted) + len(missing)
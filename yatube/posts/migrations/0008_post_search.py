@@ -0,0 +1,110 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:42
+
+import re
+
+from django.db import DatabaseError, migrations, models, transaction
+import django.db.models.deletion
+
+FTS_TABLE = 'posts_post_fts'
+
+# A copy of posts.search.tokenize as it was when this migration was
+# written, so later changes to the search code do not change it.
+WORD_RE = re.compile(r'\w+')
+
+MIN_STEM_LENGTH = 3
+
+TERM_LENGTH = 64
+
+REFLEXIVE_ENDINGS = ('ся', 'сь')
+
+# Inflectional endings of Russian adjectives, participles, verbs and
+# nouns, after the Snowball stemmer. Only the longest match is removed.
+ENDINGS = sorted({
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+    'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+    'ая', 'яя', 'ою', 'ею', 'ивш', 'ывш', 'ующ', 'ла', 'на', 'ете', 'йте',
+    'ли', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'ешь', 'нно', 'ила', 'ыла',
+    'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'уй', 'ил', 'ыл', 'ен',
+    'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить',
+    'ыть', 'ишь', 'а', 'ев', 'ов', 'ье', 'е', 'иями', 'ями', 'ами', 'еи',
+    'ии', 'и', 'ией', 'й', 'иям', 'ям', 'ием', 'ам', 'о', 'у', 'ах',
+    'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я', 'ейш',
+    'ейше', 'ость', 'ост',
+}, key=len, reverse=True)
+
+
+def stem(word):
+    for ending in REFLEXIVE_ENDINGS:
+        if word.endswith(ending) and len(word) - 2 >= MIN_STEM_LENGTH:
+            word = word[:-2]
+            break
+    for ending in ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def tokenize(text):
+    text = text.lower().replace('ё', 'е')
+    return [stem(word)[:TERM_LENGTH] for word in WORD_RE.findall(text)]
+
+
+def create_search_index(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostTerm = apps.get_model('posts', 'PostTerm')
+    connection = schema_editor.connection
+    posts = Post.objects.using(connection.alias).order_by().values_list(
+        'pk', 'text'
+    )
+    if connection.vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                    f'body, tokenize="unicode61 remove_diacritics 2")'
+                )
+        except DatabaseError:
+            pass
+        else:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, body) VALUES (%s, %s)',
+                    [(pk, ' '.join(tokenize(text))) for pk, text in posts]
+                )
+            return
+    PostTerm.objects.using(connection.alias).bulk_create(
+        PostTerm(term=term, post_id=pk)
+        for pk, text in posts
+        for term in set(tokenize(text))
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='posts.Post')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='postterm',
+            index=models.Index(fields=['term', 'post'], name='post_term_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
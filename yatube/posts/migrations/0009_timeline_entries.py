@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_timelines(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    TimelineEntry = apps.get_model('posts', 'TimelineEntry')
+    rows = Post.objects.order_by().values_list(
+        'pk', 'author_id', 'group_id', 'pub_date'
+    )
+    batch = []
+    for pk, author_id, group_id, pub_date in rows.iterator():
+        batch.append(TimelineEntry(
+            kind='a', owner_id=author_id, pub_date=pub_date, post_id=pk
+        ))
+        if group_id is not None:
+            batch.append(TimelineEntry(
+                kind='g', owner_id=group_id, pub_date=pub_date, post_id=pk
+            ))
+        if len(batch) >= 1000:
+            TimelineEntry.objects.bulk_create(batch)
+            batch = []
+    TimelineEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('a', 'author'), ('g', 'group')], max_length=1)),
+                ('owner_id', models.PositiveIntegerField()),
+                ('pub_date', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='posts.Post')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['kind', 'owner_id', '-pub_date', '-post'], name='timeline_feed_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('post', 'kind')},
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
@@ -9,11 +9,32 @@ class Group(models.Model):
     slug = models.SlugField(unique=True)
     title = models.CharField(max_length=200)
     description = models.TextField()
+    post_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self) -> CharField:
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    FEED_FIELDS = (
+        'id',
+        'text',
+        'pub_date',
+        'version',
+        'author__id',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'group__id',
+        'group__slug',
+        'group__title',
+    )
+
+    def feed(self):
+        """Posts with author and group joined in, for rendering cards."""
+        return self.select_related('author', 'group').only(*self.FEED_FIELDS)
+
+
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField(auto_now_add=True)
@@ -31,6 +52,155 @@ class Post(models.Model):
         related_name='posts',
         help_text='Группа, к которой будет относиться пост'
     )
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    CARD_FIELDS = ('text', 'group_id')
+
+    class Meta:
+        ordering = ('-pub_date', '-id')
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_feed_idx',
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Cached cards are keyed by version, so any save changing what a
+        # card shows moves the post to a new version, whoever saves it.
+        if not self._state.adding and any(
+            self.loaded_value(attname) != getattr(self, attname)
+            for attname in self.CARD_FIELDS
+        ):
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'version' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'version']
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in self.get_deferred_fields()
+        }
+
+    def loaded_value(self, attname):
+        """Value of the field as it was read from the database.
+
+        Falls back to the current value when the row was not loaded, so an
+        unknown previous value is treated as unchanged.
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        return loaded_values.get(attname, getattr(self, attname))
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+    )
+    post_count = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def post_count_for(user):
+        try:
+            return user.post_stats.post_count
+        except AuthorStats.DoesNotExist:
+            return user.posts.count()
+
+
+class PostTerm(models.Model):
+    TERM_LENGTH = 64
+
+    term = models.CharField(max_length=TERM_LENGTH)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='terms',
+    )
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('term', 'post'), name='post_term_idx'),
+        )
+
+
+class TimelineQuerySet(models.QuerySet):
+    def feed(self, kind, owner_id):
+        """Entries of one timeline with their posts ready for rendering.
+
+        Paginate on ``TimelineEntry.FEED_KEY`` and take ``entry.post`` of
+        each row, so a page is a range of the ``timeline_feed_idx`` index.
+        """
+        return self.filter(kind=kind, owner_id=owner_id).select_related(
+            'post__author', 'post__group'
+        ).only(
+            'pub_date',
+            'post_id',
+            *(f'post__{field}' for field in PostQuerySet.FEED_FIELDS)
+        )
+
+
+class TimelineEntry(models.Model):
+    """A post's place in the feed of its author or its group.
+
+    Entries copy the publication date of the post, so a page of a feed is
+    a single range of the ``timeline_feed_idx`` index. They are written on
+    every post save by the posts signals and can be regenerated with the
+    ``rebuild_timelines`` command.
+    """
+
+    AUTHOR = 'a'
+    GROUP = 'g'
+    KIND_CHOICES = (
+        (AUTHOR, 'author'),
+        (GROUP, 'group'),
+    )
+    FEED_KEY = ('pub_date', 'post_id')
+
+    kind = models.CharField(max_length=1, choices=KIND_CHOICES)
+    owner_id = models.PositiveIntegerField()
+    pub_date = models.DateTimeField()
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+
+    objects = TimelineQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('kind', 'owner_id', '-pub_date', '-post'),
+                name='timeline_feed_idx',
+            ),
+        )
+        unique_together = ('post', 'kind')
+
+    @classmethod
+    def owners_of(cls, post):
+        owners = {(cls.AUTHOR, post.author_id)}
+        if post.group_id is not None:
+            owners.add((cls.GROUP, post.group_id))
+        return owners
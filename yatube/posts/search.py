@@ -0,0 +1,203 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Post, PostTerm
+
+WORD_RE = re.compile(r'\w+')
+
+MIN_STEM_LENGTH = 3
+
+REFLEXIVE_ENDINGS = ('ся', 'сь')
+
+# Inflectional endings of Russian adjectives, participles, verbs and
+# nouns, after the Snowball stemmer. Only the longest match is removed.
+ENDINGS = sorted({
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+    'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+    'ая', 'яя', 'ою', 'ею', 'ивш', 'ывш', 'ующ', 'ла', 'на', 'ете', 'йте',
+    'ли', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'ешь', 'нно', 'ила', 'ыла',
+    'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'уй', 'ил', 'ыл', 'ен',
+    'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить',
+    'ыть', 'ишь', 'а', 'ев', 'ов', 'ье', 'е', 'иями', 'ями', 'ами', 'еи',
+    'ии', 'и', 'ией', 'й', 'иям', 'ям', 'ием', 'ам', 'о', 'у', 'ах',
+    'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я', 'ейш',
+    'ейше', 'ость', 'ост',
+}, key=len, reverse=True)
+
+
+def stem(word):
+    for ending in REFLEXIVE_ENDINGS:
+        if word.endswith(ending) and len(word) - 2 >= MIN_STEM_LENGTH:
+            word = word[:-2]
+            break
+    for ending in ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def tokenize(text):
+    """Stemmed search terms of a text, in order of appearance."""
+    text = text.lower().replace('ё', 'е')
+    return [
+        stem(word)[:PostTerm.TERM_LENGTH]
+        for word in WORD_RE.findall(text)
+    ]
+
+
+def posts_after(after_pk):
+    posts = Post.objects.order_by()
+    if after_pk is not None:
+        posts = posts.filter(pk__gt=after_pk)
+    return posts
+
+
+class FTS5Backend:
+    """SQLite FTS5 table holding the stemmed text of every post."""
+
+    table = 'posts_post_fts'
+
+    @classmethod
+    def is_available(cls):
+        return (
+            connection.vendor == 'sqlite'
+            and cls.table in connection.introspection.table_names()
+        )
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, body) VALUES (%s, %s)',
+                [post.pk, ' '.join(tokenize(post.text))]
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post_id]
+            )
+
+    def filter(self, queryset, query):
+        terms = set(tokenize(query))
+        if not terms:
+            return queryset.none()
+        match = ' AND '.join(f'"{term}"' for term in sorted(terms))
+        # pk__in=RawSQL(...) would wrap the subquery in a second pair of
+        # parentheses, which SQLite reads as a scalar, first-row-only one.
+        pk = '{}.{}'.format(
+            connection.ops.quote_name(queryset.model._meta.db_table),
+            connection.ops.quote_name(queryset.model._meta.pk.column),
+        )
+        return queryset.extra(
+            where=[
+                f'{pk} IN (SELECT rowid FROM {self.table} '
+                f'WHERE {self.table} MATCH %s)'
+            ],
+            params=[match]
+        )
+
+    def rebuild(self, batch_size=1000, after_pk=None):
+        with connection.cursor() as cursor:
+            if after_pk is None:
+                cursor.execute(f'DELETE FROM {self.table}')
+            else:
+                cursor.execute(
+                    f'DELETE FROM {self.table} WHERE rowid > %s', [after_pk]
+                )
+            rows = posts_after(after_pk).values_list('pk', 'text')
+            batch = []
+            for pk, text in rows.iterator(chunk_size=batch_size):
+                batch.append((pk, ' '.join(tokenize(text))))
+                if len(batch) >= batch_size:
+                    self._insert(cursor, batch)
+                    batch = []
+            self._insert(cursor, batch)
+
+    def _insert(self, cursor, batch):
+        if batch:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, body) VALUES (%s, %s)',
+                batch
+            )
+
+
+class InvertedIndexBackend:
+    """Postings table of stemmed terms, for databases without FTS5."""
+
+    def index(self, post):
+        PostTerm.objects.filter(post_id=post.pk).delete()
+        PostTerm.objects.bulk_create(
+            PostTerm(term=term, post_id=post.pk)
+            for term in set(tokenize(post.text))
+        )
+
+    def remove(self, post_id):
+        PostTerm.objects.filter(post_id=post_id).delete()
+
+    def filter(self, queryset, query):
+        terms = set(tokenize(query))
+        if not terms:
+            return queryset.none()
+        for term in sorted(terms):
+            queryset = queryset.filter(pk__in=PostTerm.objects.filter(
+                term=term
+            ).values('post_id'))
+        return queryset
+
+    def rebuild(self, batch_size=1000, after_pk=None):
+        terms = PostTerm.objects.all()
+        if after_pk is not None:
+            terms = terms.filter(post_id__gt=after_pk)
+        terms.delete()
+        batch = []
+        rows = posts_after(after_pk).values_list('pk', 'text')
+        for pk, text in rows.iterator(chunk_size=batch_size):
+            batch.extend(
+                PostTerm(term=term, post_id=pk)
+                for term in set(tokenize(text))
+            )
+            if len(batch) >= batch_size:
+                PostTerm.objects.bulk_create(batch)
+                batch = []
+        PostTerm.objects.bulk_create(batch)
+
+
+BACKENDS = {
+    'fts5': FTS5Backend,
+    'python': InvertedIndexBackend,
+}
+
+_backends = {}
+
+
+def get_backend():
+    """Search backend named by POST_SEARCH_BACKEND.
+
+    ``'auto'`` picks FTS5 when the migration managed to create its table
+    and falls back to the inverted index otherwise.
+    """
+    name = settings.POST_SEARCH_BACKEND
+    key = (name, connection.settings_dict['NAME'])
+    if key not in _backends:
+        if name == 'auto':
+            name = 'fts5' if FTS5Backend.is_available() else 'python'
+        _backends[key] = BACKENDS[name]()
+    return _backends[key]
+
+
+def search_posts(queryset, query):
+    return get_backend().filter(queryset, query)
+
+
+def rebuild_index(batch_size=1000, after_pk=None):
+    """Index all posts again, or only those with a pk above ``after_pk``."""
+    with transaction.atomic():
+        get_backend().rebuild(batch_size, after_pk)
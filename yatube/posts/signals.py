@@ -0,0 +1,220 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import (GROUP_SCOPE, INDEX_SCOPE, POST_SCOPE, PROFILE_SCOPE,
+                    bump_scopes, change_total_posts)
+from .models import AuthorStats, Group, Post, TimelineEntry, User
+from .search import get_backend
+from .timelines import sync_timelines
+
+# Fields of a post shown wherever it is listed, and those its timeline
+# entries are built from, under both their names and attnames.
+DISPLAYED_FIELDS = ('text', 'group', 'group_id', 'author', 'author_id',
+                    'pub_date')
+TIMELINE_FIELDS = ('group', 'group_id', 'author', 'author_id', 'pub_date')
+
+# Fields of a user shown on the cards of their posts.
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def saves_any(update_fields, *names):
+    """Whether a save with ``update_fields`` may have written the fields."""
+    return update_fields is None or not update_fields.isdisjoint(names)
+
+
+def change_author_count(author_id, delta):
+    stats = AuthorStats.objects.filter(user_id=author_id)
+    if delta < 0:
+        stats = stats.filter(post_count__gte=-delta)
+    if not stats.update(post_count=F('post_count') + delta) and delta > 0:
+        AuthorStats.objects.update_or_create(
+            user_id=author_id,
+            defaults={
+                'post_count': Post.objects.filter(author_id=author_id).count()
+            }
+        )
+
+
+def change_group_count(group_id, delta):
+    if group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(post_count__gte=-delta)
+    groups.update(post_count=F('post_count') + delta)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw, update_fields,
+                     **kwargs):
+    if raw:
+        return
+    if created:
+        change_total_posts(1)
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+        return
+    if saves_any(update_fields, 'author', 'author_id'):
+        previous_author_id = instance.loaded_value('author_id')
+        if previous_author_id != instance.author_id:
+            change_author_count(previous_author_id, -1)
+            change_author_count(instance.author_id, 1)
+    if saves_any(update_fields, 'group', 'group_id'):
+        previous_group_id = instance.loaded_value('group_id')
+        if previous_group_id != instance.group_id:
+            change_group_count(previous_group_id, -1)
+            change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    change_total_posts(-1)
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+
+
+def invalidate_post_pages(post, group_ids, author_ids=()):
+    """Bump the pages showing the post: the index, its authors, its groups
+    and the post itself."""
+    group_ids = {group_id for group_id in group_ids if group_id is not None}
+    usernames = {post.author.username}
+    author_ids = set(author_ids) - {post.author_id}
+    if author_ids:
+        usernames.update(User.objects.filter(pk__in=author_ids).values_list(
+            'username', flat=True
+        ))
+    slugs = set()
+    if post.group_id in group_ids and Post.group.is_cached(post):
+        slugs.add(post.group.slug)
+        group_ids.discard(post.group_id)
+    if group_ids:
+        slugs.update(Group.objects.filter(pk__in=group_ids).values_list(
+            'slug', flat=True
+        ))
+    bump_scopes(
+        INDEX_SCOPE,
+        POST_SCOPE.format(post_id=post.pk),
+        *(PROFILE_SCOPE.format(username=username) for username in usernames),
+        *(GROUP_SCOPE.format(slug=slug) for slug in slugs)
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, raw, update_fields, **kwargs):
+    if raw or not saves_any(update_fields, *DISPLAYED_FIELDS):
+        return
+    invalidate_post_pages(
+        instance,
+        {instance.group_id, instance.loaded_value('group_id')},
+        {instance.loaded_value('author_id')}
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    invalidate_post_pages(instance, {instance.group_id})
+
+
+@receiver(pre_save, sender=Group)
+def remember_group_slug(sender, instance, raw, **kwargs):
+    instance._previous_slug = None
+    if instance.pk is not None and not raw:
+        instance._previous_slug = Group.objects.filter(
+            pk=instance.pk
+        ).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Group)
+def invalidate_saved_group(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    bump_scopes(
+        GROUP_SCOPE.format(slug=instance.slug),
+        instance._previous_slug and GROUP_SCOPE.format(
+            slug=instance._previous_slug
+        )
+    )
+    if created:
+        return
+    # The cards on the index and on the profiles of the group's authors
+    # link to the group by its slug.
+    usernames = User.objects.filter(posts__group=instance).values_list(
+        'username', flat=True
+    ).distinct()
+    bump_scopes(
+        INDEX_SCOPE,
+        *(PROFILE_SCOPE.format(username=username) for username in usernames)
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_author_names(sender, instance, raw, update_fields, **kwargs):
+    instance._previous_names = None
+    if (
+        instance.pk is not None
+        and not raw
+        and saves_any(update_fields, *AUTHOR_FIELDS)
+    ):
+        instance._previous_names = User.objects.filter(
+            pk=instance.pk
+        ).values_list(*AUTHOR_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_author(sender, instance, raw, **kwargs):
+    previous = getattr(instance, '_previous_names', None)
+    if raw or previous is None or previous == tuple(
+        getattr(instance, field) for field in AUTHOR_FIELDS
+    ):
+        return
+    # Every feed listing the author's posts shows their names on the cards.
+    slugs = Group.objects.filter(posts__author=instance).values_list(
+        'slug', flat=True
+    ).distinct()
+    bump_scopes(
+        INDEX_SCOPE,
+        PROFILE_SCOPE.format(username=previous[0]),
+        PROFILE_SCOPE.format(username=instance.username),
+        *(GROUP_SCOPE.format(slug=slug) for slug in slugs)
+    )
+
+
+@receiver(post_delete, sender=Group)
+def invalidate_deleted_group(sender, instance, **kwargs):
+    bump_scopes(INDEX_SCOPE, GROUP_SCOPE.format(slug=instance.slug))
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, created, raw, update_fields,
+                     **kwargs):
+    if raw:
+        return
+    if created or (
+        saves_any(update_fields, 'text')
+        and instance.loaded_value('text') != instance.text
+    ):
+        get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    get_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def update_post_timelines(sender, instance, created, raw, update_fields,
+                          **kwargs):
+    if raw or (
+        not created and not saves_any(update_fields, *TIMELINE_FIELDS)
+    ):
+        return
+    sync_timelines(instance, created)
+
+
+@receiver(post_delete, sender=Group)
+def drop_group_timeline(sender, instance, **kwargs):
+    TimelineEntry.objects.filter(
+        kind=TimelineEntry.GROUP,
+        owner_id=instance.pk
+    ).delete()
@@ -0,0 +1,10 @@
+from django import template
+
+from ..cache import render_card
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post, show_group=True):
+    return render_card(post, show_group)
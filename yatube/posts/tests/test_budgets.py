@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, resolve, reverse
+
+from .. import urls
+from ..models import Group, Post
+
+User = get_user_model()
+
+# Form data of the routes whose successful POST is measured as well.
+POST_DATA = {
+    'post_create': {'text': 'New text'},
+    'post_edit': {'text': 'Edited text'},
+}
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        for i in range(15):
+            cls.post = Post.objects.create(
+                author=cls.user,
+                text=f'Test text{i}',
+                group=cls.group
+            )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.kwargs = {
+            'slug': self.group.slug,
+            'username': self.user.username,
+            'post_id': self.post.pk,
+        }
+        for data in POST_DATA.values():
+            data['group'] = self.group.pk
+
+    def addresses(self):
+        for pattern in urls.urlpatterns:
+            if isinstance(pattern, URLPattern):
+                yield pattern.name, reverse(
+                    f'{urls.app_name}:{pattern.name}',
+                    kwargs={
+                        key: self.kwargs[key]
+                        for key in pattern.pattern.converters
+                    }
+                )
+
+    def assert_within_budget(self, client, address, method='get', data=None):
+        budget = getattr(resolve(address.split('?')[0]).func,
+                         'query_budget', None)
+        self.assertIsNotNone(
+            budget,
+            f'{address} has no @query_budget on its view'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            getattr(client, method)(address, data)
+        if len(queries) > budget:
+            self.fail('\n'.join([
+                f'{method.upper()} {address} issued {len(queries)} queries '
+                f'over a budget of {budget}:',
+                *(f'{number}. {query["sql"]}'
+                  for number, query in enumerate(queries.captured_queries, 1))
+            ]))
+
+    def test_every_route_is_within_its_budget(self):
+        for name, address in self.addresses():
+            for client in (self.client, self.authorized_client):
+                for query in ('', '?page=2'):
+                    with self.subTest(address=address + query):
+                        self.assert_within_budget(client, address + query)
+            if name in POST_DATA:
+                with self.subTest(address=address, method='post'):
+                    self.assert_within_budget(
+                        self.authorized_client, address, 'post',
+                        POST_DATA[name]
+                    )
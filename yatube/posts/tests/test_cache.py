@@ -0,0 +1,343 @@
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import (Client, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+
+from ..cache import (card_cache, card_stats, page_cache, page_stats,
+                     scope_cache)
+from ..models import Group, Post
+
+User = get_user_model()
+
+TEMP_CACHE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'post_cards': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': TEMP_CACHE_DIR,
+    },
+})
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Test text',
+            group=cls.group
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_CACHE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        card_cache().clear()
+        card_stats.reset()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_card_is_rendered_once(self):
+        self.client.get(reverse('posts:index'))
+        self.assertEqual(card_stats.as_dict(), {'hits': 0, 'misses': 1})
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(card_stats.as_dict(), {'hits': 1, 'misses': 1})
+        self.assertContains(response, self.post.text)
+
+    def test_edit_bumps_card_version(self):
+        self.client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': 'Another test text', 'group': self.group.id}
+        )
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(card_stats.as_dict(), {'hits': 0, 'misses': 2})
+        self.assertContains(response, 'Another test text')
+        self.assertNotContains(response, '<p>Test text</p>')
+
+    def test_save_outside_views_bumps_card_version(self):
+        self.client.get(reverse('posts:index'))
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Edited in the admin'
+        post.save()
+        self.assertEqual(post.version, 2)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Edited in the admin')
+
+    def test_unchanged_save_keeps_card_version(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.save()
+        self.assertEqual(post.version, 1)
+
+    def test_author_rename_refreshes_card(self):
+        self.client.get(reverse('posts:index'))
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Renamed')
+
+
+@override_settings(POST_PAGE_CACHE_ENABLED=True)
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.another_user = User.objects.create_user(username='TestName2')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        cls.another_group = Group.objects.create(
+            title='Test another title',
+            slug='test_another_slug'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Test text',
+            group=cls.group
+        )
+        cls.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse(
+                'posts:group_list',
+                kwargs={'slug': cls.group.slug}
+            ),
+            'another_group': reverse(
+                'posts:group_list',
+                kwargs={'slug': cls.another_group.slug}
+            ),
+            'profile': reverse(
+                'posts:profile',
+                kwargs={'username': cls.user.username}
+            ),
+            'another_profile': reverse(
+                'posts:profile',
+                kwargs={'username': cls.another_user.username}
+            ),
+        }
+
+    def setUp(self):
+        page_cache().clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        for url in self.urls.values():
+            self.client.get(url)
+        page_stats.reset()
+
+    def assert_cached(self, *names):
+        for name, url in self.urls.items():
+            with self.subTest(page=name):
+                page_stats.reset()
+                self.client.get(url)
+                self.assertEqual(
+                    page_stats.as_dict()['hits'],
+                    int(name in names)
+                )
+
+    def test_anonymous_pages_are_served_from_cache(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.urls['index'])
+        self.assertContains(response, self.post.text)
+
+    def test_authorized_pages_are_not_cached(self):
+        self.authorized_client.get(self.urls['index'])
+        self.assertEqual(page_stats.as_dict(), {'hits': 0, 'misses': 0})
+
+    def test_create_invalidates_only_affected_feeds(self):
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'New text', 'group': self.group.id}
+        )
+        self.assert_cached('another_group', 'another_profile')
+        response = self.client.get(self.urls['group'])
+        self.assertContains(response, 'New text')
+
+    def test_edit_invalidates_old_and_new_group(self):
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': 'Test text', 'group': self.another_group.id}
+        )
+        self.assert_cached('another_profile')
+
+    def test_unchanged_edit_keeps_every_page_cached(self):
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': self.post.text, 'group': self.post.group_id}
+        )
+        self.assert_cached(*self.urls)
+
+    def test_author_change_invalidates_both_profiles(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.author = self.another_user
+        post.save()
+        self.assert_cached('another_group')
+
+    def test_group_rename_invalidates_feeds_linking_to_it(self):
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'new_slug'
+        group.save()
+        self.assert_cached('another_group', 'another_profile')
+        response = self.client.get(self.urls['index'])
+        self.assertContains(response, '/group/new_slug/')
+        self.assertNotContains(response, '/group/test_slug/')
+
+    def test_author_rename_invalidates_feeds_showing_them(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Renamed'
+        user.save()
+        self.assert_cached('another_group', 'another_profile')
+        self.assertContains(self.client.get(self.urls['index']), 'Renamed')
+
+    def test_login_keeps_every_page_cached(self):
+        self.client.force_login(self.another_user)
+        self.client.logout()
+        self.assert_cached(*self.urls)
+
+    def test_version_only_save_keeps_every_page_cached(self):
+        self.post.version += 1
+        self.post.save(update_fields=['version'])
+        self.assert_cached(*self.urls)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Test text',
+            group=cls.group
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_unchanged_feeds_are_not_modified(self):
+        feeds = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user}),
+        )
+        for address in feeds:
+            with self.subTest(address=address):
+                etag = self.client.get(address)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(
+                        address,
+                        HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.templates, [])
+
+    def test_post_detail_is_not_modified_with_one_query(self):
+        address = reverse(
+            'posts:post_detail',
+            kwargs={'post_id': self.post.id}
+        )
+        last_modified = self.client.get(address)['Last-Modified']
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                address,
+                HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_validators(self):
+        address = reverse(
+            'posts:post_detail',
+            kwargs={'post_id': self.post.id}
+        )
+        etag = self.client.get(address)['ETag']
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': 'Another test text', 'group': self.group.id}
+        )
+        response = self.client.get(address, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Another test text')
+
+    def test_group_rename_changes_post_detail_validators(self):
+        address = reverse(
+            'posts:post_detail',
+            kwargs={'post_id': self.post.id}
+        )
+        etag = self.client.get(address)['ETag']
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Renamed group'
+        group.save()
+        response = self.client.get(address, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_group_rename_changes_feed_validators(self):
+        feeds = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': self.user}),
+        )
+        etags = [self.client.get(address)['ETag'] for address in feeds]
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'new_slug'
+        group.save()
+        for address, etag in zip(feeds, etags):
+            with self.subTest(address=address):
+                response = self.client.get(address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, '/group/new_slug/')
+
+    def test_validators_depend_on_viewer(self):
+        address = reverse('posts:index')
+        self.assertNotEqual(
+            self.client.get(address)['ETag'],
+            self.authorized_client.get(address)['ETag']
+        )
+
+
+@override_settings(POST_PAGE_CACHE_ENABLED=True, DATABASE_REPLICAS=['replica'])
+class ReplicaPageTest(TransactionTestCase):
+    """Pages read from a replica right after a write may miss that write."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        page_cache().clear()
+        scope_cache().clear()
+        user = User.objects.create_user(username='TestName')
+        Post.objects.create(author=user, text='Test text')
+        page_stats.reset()
+
+    def test_fresh_pages_are_not_cached_or_validated(self):
+        address = reverse('posts:index')
+        for _ in range(2):
+            response = self.client.get(address)
+            self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(page_stats.as_dict(), {'hits': 0, 'misses': 0})
+
+    def test_pages_are_cached_once_replicas_caught_up(self):
+        address = reverse('posts:index')
+        later = time.time() + settings.DATABASE_REPLICA_PIN_SECONDS + 1
+        with mock.patch('time.time', return_value=later):
+            self.assertTrue(self.client.get(address).has_header('ETag'))
+            self.client.get(address)
+        self.assertEqual(page_stats.as_dict(), {'hits': 1, 'misses': 1})
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        cls.another_group = Group.objects.create(
+            title='Test another title',
+            slug='test_another_slug'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assert_counts(self, author, group, another_group):
+        self.group.refresh_from_db()
+        self.another_group.refresh_from_db()
+        self.assertEqual(AuthorStats.post_count_for(
+            User.objects.get(pk=self.user.pk)
+        ), author)
+        self.assertEqual(self.group.post_count, group)
+        self.assertEqual(self.another_group.post_count, another_group)
+
+    def test_counters_follow_create_edit_delete(self):
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Test text', 'group': self.group.id}
+        )
+        post = Post.objects.get(author=self.user)
+        self.assert_counts(1, 1, 0)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': 'Test text', 'group': self.another_group.id}
+        )
+        self.assert_counts(1, 0, 1)
+        Post.objects.get(pk=post.pk).delete()
+        self.assert_counts(0, 0, 0)
+
+    def test_counters_follow_author_change(self):
+        another_user = User.objects.create_user(username='TestName2')
+        post = Post.objects.create(author=self.user, text='Test')
+        post = Post.objects.get(pk=post.pk)
+        post.author = another_user
+        post.save()
+        self.assert_counts(0, 0, 0)
+        self.assertEqual(AuthorStats.post_count_for(another_user), 1)
+
+    def test_recount_posts_repairs_drift(self):
+        Post.objects.create(author=self.user, text='Test', group=self.group)
+        Group.objects.update(post_count=7)
+        AuthorStats.objects.all().delete()
+        call_command('recount_posts', stdout=StringIO())
+        self.assert_counts(1, 1, 0)
+        self.assertTrue(
+            AuthorStats.objects.filter(user=self.user, post_count=1).exists()
+        )
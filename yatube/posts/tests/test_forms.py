@@ -1,7 +1,9 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from ..models import Group, Post
@@ -65,3 +67,50 @@ class FormTest(TestCase):
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(post_edit.text, form_data['text'])
         self.assertEqual(post_edit.group.id, form_data['group'])
+
+    def edit_url(self):
+        return reverse('posts:post_edit', kwargs={'post_id': self.post.id})
+
+    def detail_url(self):
+        return reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+
+    def test_non_author_is_redirected_before_validation(self):
+        client = Client()
+        client.force_login(User.objects.create_user(username='Other'))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.edit_url(), {'text': ''})
+        # Session, user and post: the form is never bound or validated.
+        self.assertEqual(len(queries), 3)
+        self.assertRedirects(response, self.detail_url())
+        self.assertEqual(Post.objects.get(id=self.post.id).text, 'Test text')
+
+    def test_unchanged_edit_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.post(
+                self.edit_url(), {'text': self.post.text}
+            )
+        # Session, user and post, as for a GET of the form.
+        self.assertEqual(len(queries), 3)
+        self.assertFalse(any(
+            query['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))
+            for query in queries.captured_queries
+        ))
+        self.assertRedirects(response, self.detail_url())
+        self.assertEqual(Post.objects.get(id=self.post.id).version, 1)
+
+    def test_edit_updates_only_changed_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.authorized_client.post(
+                self.edit_url(), {'text': 'Edited text'}
+            )
+        updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "posts_post"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"text"', updates[0])
+        self.assertIn('"version"', updates[0])
+        self.assertNotIn('"group_id"', updates[0])
+        self.assertNotIn('"pub_date"', updates[0])
+        post = Post.objects.get(id=self.post.id)
+        self.assertEqual((post.text, post.version), ('Edited text', 2))
@@ -0,0 +1,84 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?\w+$')
+
+
+class FeedQueryPlanTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        for i in range(15):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Test text{i}',
+                group=cls.group
+            )
+
+    def assert_uses_indexes(self, address, index=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(address)
+        plans = []
+        for query in queries.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = [row[-1] for row in cursor.fetchall()]
+            plans.extend(plan)
+            for step in plan:
+                self.assertIsNone(
+                    FULL_SCAN.search(step),
+                    f'Table scan in {query["sql"]}: {step}'
+                )
+                self.assertNotIn(
+                    'TEMP B-TREE',
+                    step,
+                    f'Sort without index in {query["sql"]}: {step}'
+                )
+        if index is not None:
+            self.assertTrue(
+                any(index in step for step in plans),
+                f'{index} is not used by {address}: {plans}'
+            )
+        return response
+
+    def test_feed_queries_use_indexes(self):
+        feeds = {
+            reverse('posts:index'): 'post_feed_idx',
+            reverse(
+                'posts:group_list',
+                kwargs={'slug': self.group.slug}
+            ): 'timeline_feed_idx',
+            reverse(
+                'posts:profile',
+                kwargs={'username': self.user}
+            ): 'timeline_feed_idx',
+        }
+        for address, index in feeds.items():
+            with self.subTest(address=address):
+                page = self.assert_uses_indexes(
+                    address, index
+                ).context['page_obj']
+                self.assert_uses_indexes(
+                    f'{address}?cursor={page.next_cursor}', index
+                )
+                self.assert_uses_indexes(f'{address}?page=2', index)
+
+    def test_post_detail_uses_indexes(self):
+        post = Post.objects.first()
+        self.assert_uses_indexes(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
@@ -0,0 +1,119 @@
+import json
+from concurrent.futures import Future
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..cache import TOTAL_POSTS_KEY, scope_cache, total_posts
+from ..ingest import PostWriter, post_writer, save_new_post
+from ..models import AuthorStats, Post, TimelineEntry
+
+User = get_user_model()
+
+
+@override_settings(
+    POST_WRITE_BEHIND=True,
+    POST_WRITE_BEHIND_BATCH_SIZE=10,
+    POST_WRITE_BEHIND_MAX_DELAY=0.5,
+)
+class WriteBehindTest(TransactionTestCase):
+    # The writer thread has a connection of its own, so it only sees
+    # committed rows.
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author')
+        self.client.force_login(self.user)
+
+    def test_post_create_returns_committed_post(self):
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Written behind'}
+        )
+        self.assertRedirects(
+            response,
+            reverse('posts:profile', kwargs={'username': 'author'})
+        )
+        post = Post.objects.get(text='Written behind')
+        self.assertEqual(post.author, self.user)
+        self.assertEqual(AuthorStats.post_count_for(self.user), 1)
+        self.assertTrue(
+            TimelineEntry.objects.filter(
+                kind=TimelineEntry.AUTHOR, post=post
+            ).exists()
+        )
+        response = self.client.get(response['Location'])
+        self.assertContains(response, 'Written behind')
+
+    def test_posts_are_committed_in_batches(self):
+        writer = PostWriter()
+        batches = []
+        write = writer.write
+
+        def recording_write(batch):
+            batches.append(len(batch))
+            write(batch)
+
+        writer.write = recording_write
+        futures = [
+            writer.submit(Post(text=f'Post {number}', author=self.user))
+            for number in range(3)
+        ]
+        for future in futures:
+            self.assertTrue(future.result(5))
+        self.assertEqual(batches, [3])
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_failed_post_does_not_fail_its_batch(self):
+        writer = PostWriter()
+        good = writer.submit(Post(text='Good', author=self.user))
+        bad = writer.submit(Post(text='Bad', author_id=self.user.pk + 100))
+        self.assertTrue(good.result(5))
+        with self.assertRaises(User.DoesNotExist):
+            bad.result(5)
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Good']
+        )
+
+    def test_failed_post_drops_cached_total(self):
+        total_posts()
+        future = Future()
+        PostWriter().write([
+            (Post(text='Bad', author_id=self.user.pk + 100), future)
+        ])
+        self.assertIsNotNone(future.exception(0))
+        self.assertIsNone(scope_cache().get(TOTAL_POSTS_KEY))
+
+    @override_settings(POST_WRITE_BEHIND_TIMEOUT=0.01)
+    def test_post_left_queued_is_saved_by_request(self):
+        future = Future()
+        with mock.patch.object(post_writer, 'submit', return_value=future):
+            save_new_post(Post(text='Taken back', author=self.user))
+        self.assertTrue(future.cancelled())
+        self.assertEqual(Post.objects.get().text, 'Taken back')
+        # The writer skips the post once it gets to it.
+        PostWriter().write([(Post(text='Taken back', author=self.user),
+                             future)])
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_rolled_back_batch_is_written_post_by_post(self):
+        post = Post(text='Retried', author=self.user)
+        # As left behind by a save in a batch that failed to commit.
+        post.pk = 999
+        post._state.adding = False
+        future = Future()
+        PostWriter().write_each([(post, future)])
+        self.assertTrue(future.result(0))
+        self.assertNotEqual(post.pk, 999)
+        self.assertEqual(Post.objects.get().text, 'Retried')
+        self.assertEqual(AuthorStats.post_count_for(self.user), 1)
+
+    def test_bench_post_ingest(self):
+        out = StringIO()
+        call_command('bench_post_ingest', clients=2, posts=2, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['write_behind']['count'], 4)
+        self.assertIn('posts_per_second', report['direct'])
+        self.assertFalse(Post.objects.exists())
@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+from ..search import FTS5Backend, tokenize
+
+User = get_user_model()
+
+
+class TokenizeTest(TestCase):
+    def test_russian_word_forms_share_a_stem(self):
+        self.assertEqual(
+            tokenize('Коты, котов и КОТАМИ'),
+            ['кот', 'кот', 'и', 'кот']
+        )
+        self.assertEqual(tokenize('ёлка'), tokenize('елки'))
+
+
+class SearchMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.superuser = User.objects.create_superuser(
+            username='Admin',
+            email='admin@example.com',
+            password='password'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Рыжие коты гуляли по крыше',
+        )
+        Post.objects.create(
+            author=cls.user,
+            text='Собака спала во дворе',
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse('posts:search'), {'q': query})
+        return [post.id for post in response.context['page_obj']]
+
+    def test_search_matches_word_forms(self):
+        self.assertEqual(self.search('рыжий кот'), [self.post.id])
+        self.assertEqual(self.search('кошка'), [])
+
+    def test_search_returns_every_match(self):
+        another = Post.objects.create(author=self.user, text='Кот на крыше')
+        self.assertEqual(
+            sorted(self.search('крыша')), sorted([self.post.id, another.id])
+        )
+
+    def test_index_follows_edit_and_delete(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Чёрные вороны'
+        post.save()
+        self.assertEqual(self.search('коты'), [])
+        self.assertEqual(self.search('ворона'), [self.post.id])
+        Post.objects.get(pk=self.post.pk).delete()
+        self.assertEqual(self.search('ворона'), [])
+
+    def test_rebuild_restores_index(self):
+        Post.objects.filter(pk=self.post.pk).update(text='Белые гуси')
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('коты'), [])
+        self.assertEqual(self.search('гусь'), [self.post.id])
+
+    def test_admin_search_uses_index(self):
+        admin_client = Client()
+        admin_client.force_login(self.superuser)
+        response = admin_client.get(
+            reverse('admin:posts_post_changelist'),
+            {'q': 'котами'}
+        )
+        self.assertEqual(
+            [post.id for post in response.context['cl'].result_list],
+            [self.post.id]
+        )
+
+
+@override_settings(POST_SEARCH_BACKEND='python')
+class InvertedIndexSearchTest(SearchMixin, TestCase):
+    pass
+
+
+@override_settings(POST_SEARCH_BACKEND='fts5')
+class FTS5SearchTest(SearchMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not FTS5Backend.is_available():
+            cls.skipTest(cls, 'SQLite is built without FTS5')
+        super().setUpClass()
@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post, TimelineEntry
+
+User = get_user_model()
+
+
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        cls.another_group = Group.objects.create(
+            title='Test another title',
+            slug='test_another_slug'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def timeline(self, kind, owner):
+        return list(TimelineEntry.objects.filter(
+            kind=kind,
+            owner_id=owner.pk
+        ).order_by('-pub_date', '-post_id').values_list('post_id', flat=True))
+
+    def test_timelines_follow_create_edit_delete(self):
+        post = Post.objects.create(
+            author=self.user,
+            text='Test text',
+            group=self.group
+        )
+        self.assertEqual(self.timeline(TimelineEntry.AUTHOR, self.user),
+                         [post.pk])
+        self.assertEqual(self.timeline(TimelineEntry.GROUP, self.group),
+                         [post.pk])
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Edited text', 'group': self.another_group.pk},
+        )
+        self.assertEqual(self.timeline(TimelineEntry.GROUP, self.group), [])
+        self.assertEqual(
+            self.timeline(TimelineEntry.GROUP, self.another_group),
+            [post.pk]
+        )
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Edited text'},
+        )
+        self.assertEqual(
+            self.timeline(TimelineEntry.GROUP, self.another_group),
+            []
+        )
+        self.assertEqual(self.timeline(TimelineEntry.AUTHOR, self.user),
+                         [post.pk])
+        post.delete()
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_deleted_group_drops_its_timeline(self):
+        group = Group.objects.create(title='Test', slug='deleted_slug')
+        Post.objects.create(author=self.user, text='Test text', group=group)
+        group.delete()
+        self.assertFalse(TimelineEntry.objects.filter(
+            kind=TimelineEntry.GROUP
+        ).exists())
+
+    def test_rebuild_timelines(self):
+        posts = [
+            Post.objects.create(
+                author=self.user,
+                text=f'Test text{i}',
+                group=self.group
+            )
+            for i in range(3)
+        ]
+        expected = self.timeline(TimelineEntry.GROUP, self.group)
+        TimelineEntry.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(self.timeline(TimelineEntry.GROUP, self.group),
+                         expected)
+        self.assertEqual(self.timeline(TimelineEntry.AUTHOR, self.user),
+                         [post.pk for post in reversed(posts)])
+
+    def test_feeds_are_read_from_timelines(self):
+        post = Post.objects.create(
+            author=self.user,
+            text='Test text',
+            group=self.group
+        )
+        TimelineEntry.objects.filter(kind=TimelineEntry.GROUP).delete()
+        response = self.client.get(reverse(
+            'posts:group_list',
+            kwargs={'slug': self.group.slug}
+        ))
+        self.assertEqual(len(response.context['page_obj']), 0)
+        response = self.client.get(reverse(
+            'posts:profile',
+            kwargs={'username': self.user}
+        ))
+        self.assertEqual(list(response.context['page_obj']), [post])
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import AuthorStats, Group, Post, TimelineEntry
+from ..search import search_posts
+
+User = get_user_model()
+
+
+class TransferCommandsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='TestName',
+            password='password',
+            first_name='Test',
+        )
+        self.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug',
+            description='Test description'
+        )
+        Post.objects.create(
+            author=self.user,
+            text='Рыжие коты гуляли по крыше',
+            group=self.group
+        )
+        Post.objects.create(
+            author=self.user,
+            text='Text with, "quotes"\nand a line break'
+        )
+        Post.objects.filter(group=None).update(pub_date='2001-02-03T04:05Z')
+
+    def snapshot(self):
+        return list(Post.objects.order_by('pk').values_list(
+            'author__username', 'author__password', 'author__first_name',
+            'group__slug', 'group__description', 'text', 'pub_date'
+        ))
+
+    def round_trip(self, file_format):
+        path = os.path.join(self.temp_dir, f'posts.{file_format}')
+        expected = self.snapshot()
+        call_command('export_posts', path, format=file_format,
+                     stderr=StringIO())
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        out = StringIO()
+        call_command('import_posts', path, batch_size=1, stdout=out)
+        self.assertEqual(self.snapshot(), expected)
+        self.assertIn(
+            'created 1 groups, 1 authors and 2 posts',
+            out.getvalue()
+        )
+        self.assertEqual(Group.objects.get().post_count, 1)
+        self.assertEqual(AuthorStats.objects.get().post_count, 2)
+        self.assertTrue(search_posts(Post.objects.all(), 'кот').exists())
+
+    def test_ndjson_round_trip(self):
+        self.round_trip('ndjson')
+
+    def test_csv_round_trip(self):
+        self.round_trip('csv')
+
+    def test_import_keeps_existing_authors_and_groups(self):
+        path = os.path.join(self.temp_dir, 'posts.ndjson')
+        call_command('export_posts', path, stderr=StringIO())
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 1)
+        self.assertEqual(Group.objects.count(), 1)
+        self.assertEqual(Post.objects.count(), 4)
+
+    def test_import_rebuilds_only_new_posts(self):
+        path = os.path.join(self.temp_dir, 'posts.ndjson')
+        call_command('export_posts', path, stderr=StringIO())
+        old = list(Post.objects.values_list('pk', flat=True))
+        TimelineEntry.objects.all().delete()
+        call_command('import_posts', path, stdout=StringIO())
+        entries = TimelineEntry.objects.values_list('post_id', flat=True)
+        self.assertFalse(set(entries) & set(old))
+        self.assertEqual(len(set(entries)), 2)
+        self.assertEqual(AuthorStats.post_count_for(self.user), 4)
+        self.assertEqual(Group.objects.get().post_count, 2)
+        found = search_posts(Post.objects.all(), 'кот').values_list(
+            'pk', flat=True
+        )
+        self.assertEqual(len(set(found) - set(old)), 1)
+
+    def test_post_with_unknown_author_is_rejected(self):
+        path = os.path.join(self.temp_dir, 'broken.ndjson')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('{"type": "post", "author": "Nobody", '
+                         '"group": null, "text": "Text", '
+                         '"pub_date": "2001-02-03T04:05:00+00:00"}\n')
+        with self.assertRaisesMessage(CommandError, 'Nobody'):
+            call_command('import_posts', path, stdout=StringIO())
+
+    def test_export_to_stdout_writes_one_record_per_line(self):
+        out = StringIO()
+        call_command('export_posts', stdout=out, stderr=StringIO())
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertNotIn('', lines)
+
+    def test_post_without_pub_date_is_rejected(self):
+        path = os.path.join(self.temp_dir, 'broken.csv')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('type,author,text,pub_date\n'
+                         'post,TestName,Text,\n')
+        with self.assertRaisesMessage(CommandError, 'pub_date'):
+            call_command('import_posts', path, stdout=StringIO())
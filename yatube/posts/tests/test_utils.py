@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Post
+from ..utils import page_window
+
+User = get_user_model()
+
+
+class PageWindowTest(TestCase):
+    def test_small_paginators_show_every_page(self):
+        self.assertEqual(page_window(1, 0), [])
+        self.assertEqual(page_window(1, 1), [1])
+        self.assertEqual(page_window(3, 6), [1, 2, 3, 4, 5, 6])
+
+    def test_window_size_does_not_depend_on_page_count(self):
+        self.assertEqual(
+            page_window(500, 50000),
+            [1, None, 498, 499, 500, 501, 502, None, 50000]
+        )
+        for num_pages in (10, 1000, 50000):
+            for number in (1, 5, num_pages // 2, num_pages):
+                with self.subTest(num_pages=num_pages, number=number):
+                    window = page_window(number, num_pages)
+                    self.assertLessEqual(len(window), 9)
+                    self.assertIn(number, window)
+                    self.assertEqual(window[0], 1)
+                    self.assertEqual(window[-1], num_pages)
+
+    def test_paginator_links_are_windowed(self):
+        user = User.objects.create_user(username='TestName')
+        Post.objects.bulk_create(
+            Post(author=user, text=f'Test text{i}') for i in range(300)
+        )
+        # Bulk loads skip the post signals; the loading commands recount.
+        call_command('recount_posts', stdout=StringIO())
+        response = self.client.get(reverse('posts:index') + '?page=15')
+        self.assertContains(response, '?page=30"')
+        self.assertContains(response, '?page=17"')
+        self.assertNotContains(response, '?page=18"')
+        self.assertNotContains(response, '?page=12"')
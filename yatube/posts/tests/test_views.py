@@ -1,10 +1,17 @@
+import time
+from unittest import mock
+
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from ..models import Group, Post
+from ..utils import pagin
 
 User = get_user_model()
 
@@ -65,6 +72,8 @@ class ViewsTestContext(TestCase):
                 }
             )
         }
+        # Only the author of a post may open its edit page.
+        self.authorized_client.force_login(self.post.author)
         for template, reverse_name in templates_pages_names.items():
             with self.subTest(reverse_name=reverse_name):
                 response = self.authorized_client.get(reverse_name)
@@ -139,6 +148,7 @@ class ViewsTestContext(TestCase):
                 self.assertIsInstance(form_field, form)
 
     def test_edit_post_context_correct(self):
+        self.authorized_client.force_login(self.post_second.author)
         response = self.authorized_client.get(reverse(
             'posts:post_edit',
             kwargs={
@@ -230,3 +240,159 @@ class PaginatorViewsTest(TestCase):
             len(response.context['page_obj']),
             self.count_posts - settings.COUNTLIST
         )
+
+    def test_paginator_index_cursor_pages(self):
+        response = self.authorized_client.get(reverse('posts:index'))
+        first_page = response.context['page_obj']
+        self.assertFalse(first_page.has_previous())
+        self.assertTrue(first_page.has_next())
+        response = self.authorized_client.get(
+            reverse('posts:index') + f'?cursor={first_page.next_cursor}'
+        )
+        second_page = response.context['page_obj']
+        self.assertEqual(
+            len(second_page),
+            self.count_posts - settings.COUNTLIST
+        )
+        self.assertFalse(second_page.has_next())
+        response = self.authorized_client.get(
+            reverse('posts:index') + f'?cursor={second_page.previous_cursor}'
+        )
+        self.assertEqual(
+            list(response.context['page_obj']),
+            list(first_page)
+        )
+
+    def test_paginator_invalid_cursor_falls_back_to_first_page(self):
+        response = self.authorized_client.get(
+            reverse('posts:index') + '?cursor=broken'
+        )
+        self.assertEqual(len(response.context['page_obj']), settings.COUNTLIST)
+
+
+class FeedQueriesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        for i in range(settings.COUNTLIST + 3):
+            Post.objects.create(
+                author=User.objects.create_user(username=f'Author{i}'),
+                text=f'Test text{i}',
+                group=cls.group
+            )
+            Post.objects.create(
+                author=cls.user,
+                text=f'Test text{i}',
+                group=Group.objects.create(
+                    title=f'Test title{i}',
+                    slug=f'test_slug_{i}'
+                )
+            )
+
+    def test_feeds_do_not_query_per_post(self):
+        feeds = {
+            reverse('posts:index'): 1,
+            reverse(
+                'posts:group_list',
+                kwargs={
+                    'slug': self.group.slug
+                }
+            ): 2,
+            reverse(
+                'posts:profile',
+                kwargs={
+                    'username': self.user
+                }
+            ): 2,
+        }
+        for address, queries in feeds.items():
+            with self.subTest(address=address):
+                with self.assertNumQueries(queries):
+                    response = self.client.get(address)
+                self.assertEqual(
+                    len(response.context['page_obj']),
+                    settings.COUNTLIST
+                )
+
+
+class EstimatedCountTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestName')
+        cls.group = Group.objects.create(
+            title='Test title',
+            slug='test_slug'
+        )
+        for i in range(settings.COUNTLIST + 3):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Test text{i}',
+                group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_numbered_pages_use_counters(self):
+        addresses = (
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(address + '?page=2')
+                self.assertEqual(len(response.context['page_obj']), 3)
+                self.assertFalse(any(
+                    'COUNT(' in query['sql'] for query in queries
+                ))
+
+    def test_index_total_follows_writes(self):
+        self.client.get(reverse('posts:index') + '?page=1')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.count,
+                         settings.COUNTLIST + 3)
+        Post.objects.create(author=self.user, text='Another text')
+        response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.count,
+                         settings.COUNTLIST + 4)
+
+    def test_index_total_is_recounted_after_timeout(self):
+        self.client.get(reverse('posts:index') + '?page=2')
+        # Bulk loads skip the post signals, so the total misses them...
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Bulk text{i}') for i in range(2)
+        )
+        response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.count,
+                         settings.COUNTLIST + 3)
+        # ...until it expires and is counted again.
+        later = time.time() + settings.POST_TOTAL_TIMEOUT + 1
+        with mock.patch('time.time', return_value=later):
+            response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.count,
+                         settings.COUNTLIST + 5)
+
+    def test_drifted_counter_lands_on_real_last_page(self):
+        Group.objects.filter(pk=self.group.pk).update(post_count=1000)
+        response = self.client.get(reverse(
+            'posts:group_list',
+            kwargs={'slug': self.group.slug}
+        ) + '?page=last')
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual(len(page_obj), 3)
+        self.assertEqual(page_obj.paginator.count, settings.COUNTLIST + 3)
+
+    def test_exact_count_ignores_estimate(self):
+        request = RequestFactory().get('/', {'page': '1'})
+        page_obj = pagin(request, Post.objects.all(), count=1000,
+                         exact_count=True)
+        self.assertEqual(page_obj.paginator.count, settings.COUNTLIST + 3)
@@ -0,0 +1,57 @@
+from django.db import transaction
+
+from .models import Post, TimelineEntry
+
+
+def sync_timelines(post, created):
+    """Make the timeline entries of a saved post match its fields."""
+    owners = TimelineEntry.owners_of(post)
+    previous_owners = set()
+    if not created:
+        previous_owners = TimelineEntry.owners_of(Post(
+            author_id=post.loaded_value('author_id'),
+            group_id=post.loaded_value('group_id'),
+        ))
+        if post.loaded_value('pub_date') != post.pub_date:
+            TimelineEntry.objects.filter(post_id=post.pk).update(
+                pub_date=post.pub_date
+            )
+    for kind, owner_id in previous_owners - owners:
+        TimelineEntry.objects.filter(post_id=post.pk, kind=kind).delete()
+    TimelineEntry.objects.bulk_create(
+        TimelineEntry(
+            kind=kind,
+            owner_id=owner_id,
+            pub_date=post.pub_date,
+            post_id=post.pk,
+        )
+        for kind, owner_id in owners - previous_owners
+    )
+
+
+def rebuild_timelines(batch_size=1000, after_pk=None):
+    """Regenerate the timeline entries of all posts, or only of those with
+    a pk greater than ``after_pk``."""
+    posts = Post.objects.order_by()
+    entries = TimelineEntry.objects.all()
+    if after_pk is not None:
+        posts = posts.filter(pk__gt=after_pk)
+        entries = entries.filter(post_id__gt=after_pk)
+    with transaction.atomic():
+        entries.delete()
+        rows = posts.values_list('pk', 'author_id', 'group_id', 'pub_date')
+        batch = []
+        for pk, author_id, group_id, pub_date in rows.iterator(
+            chunk_size=batch_size
+        ):
+            post = Post(pk=pk, author_id=author_id, group_id=group_id,
+                        pub_date=pub_date)
+            batch.extend(
+                TimelineEntry(kind=kind, owner_id=owner_id,
+                              pub_date=pub_date, post_id=pk)
+                for kind, owner_id in TimelineEntry.owners_of(post)
+            )
+            if len(batch) >= batch_size:
+                TimelineEntry.objects.bulk_create(batch)
+                batch = []
+        TimelineEntry.objects.bulk_create(batch)
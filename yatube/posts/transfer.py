@@ -0,0 +1,250 @@
+import csv
+import json
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import Group, Post
+
+User = get_user_model()
+
+GROUP = 'group'
+AUTHOR = 'author'
+POST = 'post'
+
+FIELDS = {
+    GROUP: ('slug', 'title', 'description'),
+    AUTHOR: (
+        'username',
+        'first_name',
+        'last_name',
+        'email',
+        'password',
+        'is_active',
+        'date_joined',
+    ),
+    POST: ('author', 'group', 'text', 'pub_date'),
+}
+
+CSV_FIELDS = ('type',) + tuple(dict.fromkeys(
+    field for kind in (GROUP, AUTHOR, POST) for field in FIELDS[kind]
+))
+
+
+class TransferError(ValueError):
+    pass
+
+
+def export_records(batch_size=1000):
+    """Groups, then authors, then posts as flat dicts.
+
+    Every queryset is read with a server-side iterator, so memory use does
+    not grow with the number of rows. Posts refer to their author and group
+    by username and slug, which the importer maps back to ids.
+    """
+    groups = Group.objects.order_by('pk').values_list(*FIELDS[GROUP])
+    for row in groups.iterator(chunk_size=batch_size):
+        yield record(GROUP, row)
+    authors = User.objects.filter(
+        pk__in=Post.objects.values('author')
+    ).order_by('pk').values_list(*FIELDS[AUTHOR])
+    for row in authors.iterator(chunk_size=batch_size):
+        yield record(AUTHOR, row)
+    posts = Post.objects.order_by('pk').values_list(
+        'author__username', 'group__slug', 'text', 'pub_date'
+    )
+    for row in posts.iterator(chunk_size=batch_size):
+        yield record(POST, row)
+
+
+def record(kind, row):
+    values = {'type': kind}
+    for field, value in zip(FIELDS[kind], row):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        values[field] = value
+    return values
+
+
+def write_ndjson(records, stream):
+    rows = 0
+    for values in records:
+        # One write per line: a command's OutputWrapper adds the newline
+        # to any string that does not already end with one.
+        stream.write(json.dumps(values, ensure_ascii=False) + '\n')
+        rows += 1
+    return rows
+
+
+def write_csv(records, stream):
+    writer = csv.DictWriter(stream, CSV_FIELDS)
+    writer.writeheader()
+    rows = 0
+    for values in records:
+        writer.writerow(values)
+        rows += 1
+    return rows
+
+
+def read_ndjson(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        kind = row['type']
+        values = {'type': kind}
+        for field in FIELDS.get(kind, ()):
+            values[field] = row.get(field) or None
+        if kind == AUTHOR:
+            values['is_active'] = values['is_active'] != 'False'
+        yield values
+
+
+WRITERS = {
+    'ndjson': write_ndjson,
+    'csv': write_csv,
+}
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+def parse_pub_date(value):
+    try:
+        pub_date = parse_datetime(value or '')
+    except ValueError:
+        pub_date = None
+    if pub_date is None:
+        raise TransferError(f'Post has an invalid pub_date {value!r}')
+    return pub_date
+
+
+@contextmanager
+def preserved_auto_now(model, *names):
+    """Let ``bulk_create`` keep the dates it is given for these fields."""
+    fields = [model._meta.get_field(name) for name in names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Importer:
+    """Batch loader for the records produced by ``export_records``.
+
+    Rows are written with ``bulk_create``, so no ``post_save`` receivers
+    run; the caller is expected to rebuild counters and indexes of the
+    posts with a pk above ``after_pk`` once the import is over. Groups and
+    authors that already exist are kept as they are and only mapped to
+    their ids.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.after_pk = Post.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        self.group_ids = dict(Group.objects.values_list('slug', 'pk'))
+        self.author_ids = dict(User.objects.values_list('username', 'pk'))
+        self.pending = {GROUP: [], AUTHOR: [], POST: []}
+        self.created = {GROUP: 0, AUTHOR: 0, POST: 0}
+        self.touched_groups = set()
+        self.touched_authors = set()
+
+    def add(self, values):
+        kind = values.get('type')
+        if kind not in self.pending:
+            raise TransferError(f'Unknown record type: {kind!r}')
+        if kind == POST and (self.pending[GROUP] or self.pending[AUTHOR]):
+            self.flush(GROUP)
+            self.flush(AUTHOR)
+        self.pending[kind].append(values)
+        if len(self.pending[kind]) >= self.batch_size:
+            self.flush(kind)
+
+    def finish(self):
+        for kind in (GROUP, AUTHOR, POST):
+            self.flush(kind)
+
+    def flush(self, kind):
+        batch, self.pending[kind] = self.pending[kind], []
+        if batch:
+            with transaction.atomic():
+                getattr(self, f'create_{kind}s')(batch)
+
+    def create_groups(self, batch):
+        new = {
+            values['slug']: Group(
+                slug=values['slug'],
+                title=values['title'],
+                description=values['description'] or '',
+            )
+            for values in batch
+            if values['slug'] not in self.group_ids
+        }
+        Group.objects.bulk_create(new.values())
+        self.group_ids.update(
+            Group.objects.filter(slug__in=new).values_list('slug', 'pk')
+        )
+        self.created[GROUP] += len(new)
+
+    def create_authors(self, batch):
+        new = {}
+        for values in batch:
+            if values['username'] in self.author_ids:
+                continue
+            author = User(**{
+                field: values.get(field) for field in FIELDS[AUTHOR]
+                if values.get(field) is not None
+            })
+            if not author.password:
+                author.set_unusable_password()
+            new[author.username] = author
+        User.objects.bulk_create(new.values())
+        self.author_ids.update(
+            User.objects.filter(
+                username__in=new
+            ).values_list('username', 'pk')
+        )
+        self.created[AUTHOR] += len(new)
+
+    def create_posts(self, batch):
+        posts = []
+        for values in batch:
+            try:
+                author_id = self.author_ids[values['author']]
+            except KeyError:
+                raise TransferError(
+                    f'Post refers to unknown author {values["author"]!r}'
+                )
+            group_id = None
+            if values['group']:
+                try:
+                    group_id = self.group_ids[values['group']]
+                except KeyError:
+                    raise TransferError(
+                        f'Post refers to unknown group {values["group"]!r}'
+                    )
+                self.touched_groups.add(values['group'])
+            self.touched_authors.add(values['author'])
+            posts.append(Post(
+                author_id=author_id,
+                group_id=group_id,
+                text=values['text'] or '',
+                pub_date=parse_pub_date(values['pub_date']),
+            ))
+        with preserved_auto_now(Post, 'pub_date'):
+            Post.objects.bulk_create(posts)
+        self.created[POST] += len(posts)
@@ -1,9 +1,225 @@
-from django.core.paginator import Paginator
 from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
+FEED_KEY = ('pub_date', 'id')
 
-def pagin(request, post_list):
-    paginator = Paginator(post_list, settings.COUNTLIST)
+NEXT = 'n'
+PREVIOUS = 'p'
+
+LAST = 'last'
+
+
+def encode_cursor(direction, pub_date, pk):
+    raw = f'{direction}|{pub_date.isoformat()}|{pk}'
+    return urlsafe_base64_encode(force_bytes(raw))
+
+
+def decode_cursor(token):
+    """Return (direction, pub_date, pk) or None for a malformed token."""
+    try:
+        direction, pub_date, pk = force_text(
+            urlsafe_base64_decode(token)
+        ).split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+def page_window(number, num_pages, on_each_side=2):
+    """Page numbers around ``number`` plus the first and last pages.
+
+    Gaps are marked with None, so the result never has more than
+    ``2 * on_each_side + 5`` items however many pages there are.
+    """
+    if num_pages < 1:
+        return []
+    start = max(number - on_each_side, 2)
+    end = min(number + on_each_side, num_pages - 1)
+    if start <= 3:
+        start = 2
+    if end >= num_pages - 2:
+        end = num_pages - 1
+    window = [1]
+    if start > 2:
+        window.append(None)
+    window.extend(range(start, end + 1))
+    if end < num_pages - 1:
+        window.append(None)
+    if num_pages > 1:
+        window.append(num_pages)
+    return window
+
+
+class FeedPage(Page):
+    def page_window(self):
+        return page_window(self.number, self.paginator.num_pages)
+
+
+class FeedPaginator(Paginator):
+    """Paginator that can take its count from a cheaper source.
+
+    ``count`` is a number or a callable returning one, such as a
+    denormalized counter; it is only evaluated when the count is needed.
+    An estimate that runs past the real end of the feed is dropped in
+    favour of an exact COUNT(*) as soon as it yields an empty page.
+    """
+
+    def __init__(self, object_list, per_page, count=None, transform=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_source = count
+        self.transform = transform
+
+    @property
+    def has_count_source(self):
+        return self.count_source is not None
+
+    @cached_property
+    def count(self):
+        if self.count_source is None:
+            return super().count
+        if callable(self.count_source):
+            return self.count_source()
+        return self.count_source
+
+    def page(self, number):
+        page = super().page(number)
+        if self.has_count_source and page.number > 1 and not page:
+            self.count_source = None
+            self.__dict__.pop('count', None)
+            self.__dict__.pop('num_pages', None)
+            return super().page(min(page.number, self.num_pages))
+        return page
+
+    def _get_page(self, object_list, number, paginator):
+        return FeedPage(self.transformed(object_list), number, paginator)
+
+    def transformed(self, rows):
+        if self.transform is None:
+            return list(rows)
+        return [self.transform(row) for row in rows]
+
+
+class CursorPage(Page):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(FeedPaginator):
+    """Keyset paginator seeking on (pub_date, id) instead of OFFSET.
+
+    Pages are addressed by opaque cursor tokens, so no COUNT(*) is issued
+    unless ``count`` or ``num_pages`` is accessed explicitly. The seek
+    condition is spelled with a bare range on pub_date so the database can
+    start from the cursor position in the feed index. ``key`` names the
+    fields holding the post's pub_date and id, so a feed can be read from
+    another table, such as a timeline, and turned into posts by
+    ``transform``.
+    """
+
+    def __init__(self, object_list, per_page, count=None, transform=None,
+                 key=FEED_KEY, **kwargs):
+        super().__init__(object_list, per_page, count, transform, **kwargs)
+        self.key = key
+
+    def get_cursor_page(self, token=None):
+        date_field, id_field = self.key
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            rows, has_more = self._fetch(self.object_list, descending=True)
+            return self._make_page(rows, has_next=has_more,
+                                   has_previous=False)
+        direction, pub_date, pk = cursor
+        if direction == NEXT:
+            rows, has_more = self._fetch(self.object_list.filter(
+                Q(**{f'{date_field}__lt': pub_date})
+                | Q(**{f'{id_field}__lt': pk}),
+                **{f'{date_field}__lte': pub_date}
+            ), descending=True)
+            page = self._make_page(rows, has_next=has_more,
+                                   has_previous=True)
+        else:
+            rows, has_more = self._fetch(self.object_list.filter(
+                Q(**{f'{date_field}__gt': pub_date})
+                | Q(**{f'{id_field}__gt': pk}),
+                **{f'{date_field}__gte': pub_date}
+            ), descending=False)
+            rows.reverse()
+            page = self._make_page(rows, has_next=True,
+                                   has_previous=has_more)
+        if not rows:
+            return self.get_cursor_page()
+        return page
+
+    def _fetch(self, queryset, descending):
+        ordering = ordering_for(self.key, descending)
+        rows = self.transformed(
+            queryset.order_by(*ordering)[:self.per_page + 1]
+        )
+        return rows[:self.per_page], len(rows) > self.per_page
+
+    def _make_page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(NEXT, last.pub_date, last.pk)
+        if rows and has_previous:
+            first = rows[0]
+            previous_cursor = encode_cursor(PREVIOUS, first.pub_date,
+                                            first.pk)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+def ordering_for(key, descending=True):
+    return tuple(f'-{field}' if descending else field for field in key)
+
+
+def pagin(request, post_list, count=None, exact_count=False,
+          transform=None, key=FEED_KEY):
+    """Paginate a feed by cursor, falling back to ``?page=`` links.
+
+    ``count`` is an estimated size of the feed used instead of COUNT(*);
+    pass ``exact_count=True`` where the numbers must be exact. ``transform``
+    and ``key`` are passed on to ``CursorPaginator``.
+    """
+    post_list = post_list.order_by(*ordering_for(key))
+    if exact_count:
+        count = None
     page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if page_number is not None:
+        paginator = FeedPaginator(post_list, settings.COUNTLIST, count,
+                                  transform)
+        if page_number == LAST:
+            page_number = paginator.num_pages
+        page_obj = paginator.get_page(page_number)
+    else:
+        paginator = CursorPaginator(post_list, settings.COUNTLIST, count,
+                                    transform, key)
+        page_obj = paginator.get_cursor_page(request.GET.get('cursor'))
+    params = request.GET.copy()
+    params.pop('page', None)
+    params.pop('cursor', None)
+    page_obj.query_prefix = f'{params.urlencode()}&' if params else ''
     return page_obj
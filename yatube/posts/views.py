@@ -1,24 +1,44 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
+from core.decorators import query_budget
+from core.routers import use_replica
+
+from .cache import (GROUP_SCOPE, INDEX_SCOPE, POST_SCOPE, PROFILE_SCOPE,
+                    cache_anonymous_page, conditional_page, total_posts)
 from .forms import PostForm
-from .models import Group, Post, User
+from .ingest import save_new_post
+from .models import AuthorStats, Group, Post, TimelineEntry, User
+from .search import search_posts
 from .utils import pagin
 
 
+@query_budget(3)
+@use_replica
+@conditional_page(INDEX_SCOPE)
+@cache_anonymous_page(INDEX_SCOPE)
 def index(request):
-    post_list = Post.objects.all().order_by('-pub_date')
-    page_obj = pagin(request, post_list)
+    post_list = Post.objects.feed()
+    page_obj = pagin(request, post_list, count=total_posts)
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+def timeline_post(entry):
+    return entry.post
+
+
+@query_budget(4)
+@use_replica
+@conditional_page(GROUP_SCOPE)
+@cache_anonymous_page(GROUP_SCOPE)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    page_obj = pagin(request, post_list)
+    entries = TimelineEntry.objects.feed(TimelineEntry.GROUP, group.pk)
+    page_obj = pagin(request, entries, count=group.post_count,
+                     transform=timeline_post, key=TimelineEntry.FEED_KEY)
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -26,11 +46,19 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@query_budget(4)
+@use_replica
+@conditional_page(PROFILE_SCOPE)
+@cache_anonymous_page(PROFILE_SCOPE)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    post_count = posts.count()
-    page_obj = pagin(request, posts)
+    author = get_object_or_404(
+        User.objects.select_related('post_stats'),
+        username=username
+    )
+    entries = TimelineEntry.objects.feed(TimelineEntry.AUTHOR, author.pk)
+    post_count = AuthorStats.post_count_for(author)
+    page_obj = pagin(request, entries, count=post_count,
+                     transform=timeline_post, key=TimelineEntry.FEED_KEY)
     context = {
         'author': author,
         'post_count': post_count,
@@ -39,21 +67,59 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+def post_detail_scopes(request, post_id):
+    row = Post.objects.filter(pk=post_id).values_list(
+        'author__username', 'group__slug'
+    ).first()
+    if row is None:
+        return []
+    username, slug = row
+    scopes = [
+        POST_SCOPE.format(post_id=post_id),
+        PROFILE_SCOPE.format(username=username),
+    ]
+    if slug is not None:
+        scopes.append(GROUP_SCOPE.format(slug=slug))
+    return scopes
+
+
+@query_budget(4)
+@use_replica
+@conditional_page(post_detail_scopes)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__post_stats', 'group'),
+        id=post_id
+    )
     context = {
         'post': post,
+        'post_count': AuthorStats.post_count_for(post.author),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(3)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = Post.objects.none()
+    if query:
+        post_list = search_posts(Post.objects.feed(), query)
+    page_obj = pagin(request, post_list)
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@query_budget(10)
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
-        post.save()
+        save_new_post(post)
         return redirect('posts:profile', post.author)
     context = {
         'form': form
@@ -61,13 +127,17 @@ def post_create(request):
     return render(request, 'posts/create_post.html', context)
 
 
+@query_budget(8)
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(Post.objects.select_related('author'), id=post_id)
+    if post.author_id != request.user.pk:
+        return redirect('posts:post_detail', post_id)
     is_edit = True
     form = PostForm(request.POST or None, instance=post)
-    if form.is_valid() and post.author == request.user:
-        post.save()
+    if form.is_valid():
+        if form.has_changed():
+            post.save(update_fields=form.changed_data)
         return redirect('posts:post_detail', post_id)
     context = {
         'form': form,
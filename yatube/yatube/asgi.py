@@ -0,0 +1,22 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``. Django 2.2 has no ASGI handler of its own, so the WSGI
+application is served from a bounded thread pool, ASGI_THREADS threads
+per process, by core.asgi.WsgiToAsgi.
+
+Run with any ASGI server, e.g. ``uvicorn yatube.asgi:application``.
+"""
+
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+from django.conf import settings  # noqa: E402
+
+from core.asgi import WsgiToAsgi  # noqa: E402
+
+from .wsgi import application as wsgi_application  # noqa: E402
+
+application = WsgiToAsgi(wsgi_application, settings.ASGI_THREADS)
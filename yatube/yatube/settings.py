@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -35,7 +36,20 @@ ALLOWED_HOSTS = [
     'testserver',
 ]
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Views only spool mail; ``manage.py send_queued_mail`` sends it in batches
+# through EMAIL_QUEUE_BACKEND, here writing to EMAIL_FILE_PATH.
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+
+EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_QUEUE_PATH = os.path.join(BASE_DIR, 'mail_queue')
+
+EMAIL_QUEUE_BATCH_SIZE = 50
+
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+
+# Seconds before the first retry of a failed message, doubled every retry.
+EMAIL_QUEUE_RETRY_DELAY = 30
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
@@ -58,12 +72,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -73,7 +89,7 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -88,8 +104,41 @@ TEMPLATES = [
     },
 ]
 
+TEMPLATE_WARMUP = False
+
+# Share of requests measured by core.middleware.RequestTimingMiddleware.
+REQUEST_TIMING_SAMPLE_RATE = 1.0
+
+# Seconds between logged summaries of the measured requests.
+REQUEST_TIMING_LOG_INTERVAL = 60
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'yatube.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'yatube.mail': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Threads running views for each process served through yatube/asgi.py.
+ASGI_THREADS = 16
+
 
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
@@ -98,13 +147,101 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    },
+    # The same file under a second alias, so replica routing can be tried
+    # out by adding it to DATABASE_REPLICAS. Tests read the test database.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Aliases of read-only copies of default, see core.routers.
+DATABASE_REPLICAS = []
+
+# For how long a client reads from default after it wrote something.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+# PRAGMA statements run on every new SQLite connection by core.db.
+SQLITE_PRAGMAS = {}
+
+# Check persistent connections at the start of every request, see core.db.
+DATABASE_HEALTH_CHECKS = False
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'post_cards': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'post-cards',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
 }
 
+POST_CARD_CACHE = 'post_cards'
+
+POST_PAGE_CACHE = 'default'
+
+# Scope tokens behind ETags and cached pages, and the post total. Every
+# process serving the site must share this cache; a locmem one only works
+# with a single process, as with runserver.
+POST_SCOPE_CACHE = 'default'
+
+# Seconds before the cached post total is counted again.
+POST_TOTAL_TIMEOUT = 60
+
+POST_PAGE_CACHE_ENABLED = False
+
+POST_SEARCH_BACKEND = 'auto'
+
+# With POST_WRITE_BEHIND, post_create hands new posts to one writer thread
+# per process, which commits up to POST_WRITE_BEHIND_BATCH_SIZE of them per
+# transaction, waiting at most POST_WRITE_BEHIND_MAX_DELAY seconds for a
+# batch to fill. The request still waits for its post to be committed.
+POST_WRITE_BEHIND = False
+
+POST_WRITE_BEHIND_BATCH_SIZE = 50
+
+POST_WRITE_BEHIND_MAX_DELAY = 0.005
+
+# Seconds a request leaves its post queued before saving it itself.
+POST_WRITE_BEHIND_TIMEOUT = 10
+
+# Sessions are only written when their data changes. Expired database
+# sessions are removed in batches by ``manage.py clear_expired_sessions``.
+SESSION_SAVE_EVERY_REQUEST = False
+
+SESSION_CLEANUP_BATCH_SIZE = 1000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
+# The first hasher makes new hashes; users with a hash of another one, or
+# of other PASSWORD_HASH_ITERATIONS, are rehashed when they log in.
+PASSWORD_HASHERS = [
+    'core.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+if find_spec('argon2'):
+    PASSWORD_HASHERS.insert(
+        0, 'django.contrib.auth.hashers.Argon2PasswordHasher'
+    )
+
+PASSWORD_HASH_ITERATIONS = 150000
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -0,0 +1,156 @@
+"""
+Production settings for yatube.
+
+Select with DJANGO_SETTINGS_MODULE=yatube.settings_production.
+"""
+
+import os
+
+from . import settings as base
+from .settings import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ.get('SECRET_KEY', base.SECRET_KEY)
+
+DEBUG = False
+
+# Templates are parsed once per process by the cached loader and compiled
+# at startup by wsgi.py, so no request pays for locating or parsing them.
+
+TEMPLATES = [
+    {
+        **base.TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **base.TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+TEMPLATE_WARMUP = True
+
+# Postgres is used when POSTGRES_DB is set and SQLite otherwise. Postgres
+# connections are kept for CONN_MAX_AGE seconds and checked before every
+# request; SQLite runs in WAL mode so writers do not block readers. Feed
+# reads go to the replicas listed in POSTGRES_REPLICA_HOSTS or to the
+# SQLITE_REPLICA file.
+
+if os.environ.get('POSTGRES_DB'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', ''),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', ''),
+            'PORT': os.environ.get('POSTGRES_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 60)),
+        }
+    }
+    DATABASE_HEALTH_CHECKS = True
+    for number, host in enumerate(
+        filter(None, os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(','))
+    ):
+        DATABASES[f'replica{number}'] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'TEST': {'MIRROR': 'default'},
+        }
+elif os.environ.get('SQLITE_REPLICA'):
+    # A second SQLite file stands in for a replica locally; fill it with
+    # ``manage.py sync_replicas``.
+    DATABASES = {
+        **base.DATABASES,
+        'replica': {
+            **base.DATABASES['default'],
+            'NAME': os.environ['SQLITE_REPLICA'],
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+else:
+    DATABASES = {'default': base.DATABASES['default']}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+# SESSION_MODE 'cached_db' reads sessions from a cache shared by all the
+# processes of a host and writes them through to the database, and
+# 'signed_cookies' keeps them in the cookie, off the server altogether;
+# 'db' is Django's default. Either way an authenticated request no longer
+# reads django_session.
+
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db')
+
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+
+CACHES = {
+    **base.CACHES,
+    'sessions': {
+        'BACKEND': os.environ.get(
+            'SESSION_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'SESSION_CACHE_LOCATION',
+            os.path.join(base.BASE_DIR, 'session_cache'),
+        ),
+    },
+}
+
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Scope tokens and the post total must be the same in every process, or
+# one process keeps answering 304 for pages another one has changed.
+CACHES['scopes'] = {
+    'BACKEND': os.environ.get(
+        'SCOPE_CACHE_BACKEND',
+        'django.core.cache.backends.filebased.FileBasedCache',
+    ),
+    'LOCATION': os.environ.get(
+        'SCOPE_CACHE_LOCATION',
+        os.path.join(base.BASE_DIR, 'scope_cache'),
+    ),
+}
+
+POST_SCOPE_CACHE = 'scopes'
+
+# Queued mail goes out over SMTP when EMAIL_HOST is set.
+if os.environ.get('EMAIL_HOST'):
+    EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    EMAIL_HOST = os.environ['EMAIL_HOST']
+    EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
+    EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+    EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+    EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', '1') == '1'
+    EMAIL_TIMEOUT = 10
+
+EMAIL_QUEUE_PATH = os.environ.get('EMAIL_QUEUE_PATH', base.EMAIL_QUEUE_PATH)
+
+POST_WRITE_BEHIND = os.environ.get('POST_WRITE_BEHIND') == '1'
+
+PASSWORD_HASH_ITERATIONS = int(
+    os.environ.get('PASSWORD_HASH_ITERATIONS', base.PASSWORD_HASH_ITERATIONS)
+)
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.environ.get('REQUEST_TIMING_SAMPLE_RATE', 0.01)
+)
+
+REQUEST_TIMING_LOG_INTERVAL = 300
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 32))
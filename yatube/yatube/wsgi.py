@@ -14,3 +14,17 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.password_validation import (  # noqa: E402
+    get_default_password_validators
+)
+
+if settings.TEMPLATE_WARMUP:
+    from core.template_warmup import warm_templates
+
+    warm_templates()
+
+# The validators are built once per process; building them now loads the
+# common password list before the first signup or password change.
+get_default_password_validators()